@@ -0,0 +1,36 @@
+"""create_data_version
+
+Revision ID: 20d6af5ba0aa
+Revises: a3c123e98982
+Create Date: 2026-10-18 14:21:07.512903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20d6af5ba0aa'
+down_revision: Union[str, None] = 'a3c123e98982'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "data_version",
+        sa.Column("name", sa.String(length=64), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("name", name="pk_data_version"),
+    )
+    op.execute("INSERT INTO data_version (name, version, updated_at) VALUES ('regular_market', 0, SYSUTCDATETIME())")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("data_version")
@@ -0,0 +1,45 @@
+"""create_regular_market_ticks
+
+Revision ID: 7d08f0f54f8d
+Revises: 52af0f9a71cb
+Create Date: 2026-10-18 09:12:41.318274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d08f0f54f8d'
+down_revision: Union[str, None] = '52af0f9a71cb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Clustered on (security_desc, timestamp): a security's ticks are stored in
+    # date order, so a date range for one security is a single contiguous seek.
+    op.create_table(
+        "regular_market_ticks",
+        sa.Column("security_desc", sa.String(length=255), nullable=False),
+        sa.Column("trades", sa.Integer(), nullable=False),
+        sa.Column("tta", sa.Float(precision=53), nullable=False),
+        sa.Column("open", sa.Float(precision=53), nullable=False),
+        sa.Column("high", sa.Float(precision=53), nullable=False),
+        sa.Column("low", sa.Float(precision=53), nullable=False),
+        sa.Column("ltp", sa.Float(precision=53), nullable=False),
+        sa.Column("lty", sa.Float(precision=53), nullable=False),
+        sa.Column("timestamp", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("security_desc", "timestamp", name="pk_regular_market_ticks", mssql_clustered=True),
+    )
+    op.create_index(op.f("ix_regular_market_ticks_timestamp"), "regular_market_ticks", ["timestamp"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_regular_market_ticks_timestamp"), table_name="regular_market_ticks")
+    op.drop_table("regular_market_ticks")
@@ -0,0 +1,44 @@
+"""create_security_desc_timestamp_index
+
+Revision ID: 8a8187f735f9
+Revises: 7d08f0f54f8d
+Create Date: 2026-10-18 10:04:17.552103
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a8187f735f9'
+down_revision: Union[str, None] = '7d08f0f54f8d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PRICE_COLUMNS = ["trades", "tta", "open", "high", "low", "ltp", "lty"]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Covers the per-security history (ordered by timestamp) and the latest-row
+    # lookups without a sort or key lookup. It supersedes the single column
+    # security_desc index, which is a prefix of it.
+    op.create_index(
+        op.f("ix_regular_market_security_desc_timestamp"),
+        "regular_market",
+        ["security_desc", sa.text("timestamp DESC")],
+        unique=False,
+        mssql_include=PRICE_COLUMNS,
+    )
+    op.create_index(op.f("ix_regular_market_timestamp"), "regular_market", ["timestamp"], unique=False)
+    op.drop_index(op.f("ix_regular_market_security_desc"), table_name="regular_market")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f("ix_regular_market_security_desc"), "regular_market", ["security_desc"], unique=False)
+    op.drop_index(op.f("ix_regular_market_timestamp"), table_name="regular_market")
+    op.drop_index(op.f("ix_regular_market_security_desc_timestamp"), table_name="regular_market")
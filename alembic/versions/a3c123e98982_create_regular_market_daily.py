@@ -0,0 +1,66 @@
+"""create_regular_market_daily
+
+Revision ID: a3c123e98982
+Revises: 8a8187f735f9
+Create Date: 2026-10-18 11:26:53.904410
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c123e98982'
+down_revision: Union[str, None] = '8a8187f735f9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "regular_market_daily",
+        sa.Column("security_desc", sa.String(length=255), nullable=False),
+        sa.Column("trade_date", sa.Date(), nullable=False),
+        sa.Column("trades", sa.BigInteger(), nullable=False),
+        sa.Column("tta", sa.Float(), nullable=False),
+        sa.Column("high", sa.Float(precision=53), nullable=False),
+        sa.Column("low", sa.Float(precision=53), nullable=False),
+        sa.Column("ltp", sa.Float(precision=53), nullable=False),
+        sa.Column("last_timestamp", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("security_desc", "trade_date", name="pk_regular_market_daily", mssql_clustered=True),
+    )
+    # Backfill the rollup from the existing history
+    op.execute(
+        """
+        INSERT INTO regular_market_daily
+            (security_desc, trade_date, trades, tta, high, low, ltp, last_timestamp)
+        SELECT day_agg.security_desc, day_agg.trade_date, day_agg.trades, day_agg.tta,
+               day_agg.high, day_agg.low, last_row.ltp, day_agg.last_timestamp
+        FROM (
+            SELECT security_desc,
+                   CAST([timestamp] AS DATE) AS trade_date,
+                   SUM(CAST(trades AS BIGINT)) AS trades,
+                   SUM(CAST(tta AS FLOAT)) AS tta,
+                   MAX(high) AS high,
+                   MIN(low) AS low,
+                   MAX([timestamp]) AS last_timestamp
+            FROM regular_market
+            GROUP BY security_desc, CAST([timestamp] AS DATE)
+        ) AS day_agg
+        CROSS APPLY (
+            SELECT TOP 1 rm.ltp
+            FROM regular_market AS rm
+            WHERE rm.security_desc = day_agg.security_desc AND rm.[timestamp] = day_agg.last_timestamp
+            ORDER BY rm.id DESC
+        ) AS last_row
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("regular_market_daily")
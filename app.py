@@ -1,14 +1,140 @@
 import dash
 import logging
-from dash import dcc, html, Input, Output, State
-import plotly.graph_objects as go
+import flask
+from dash import ctx, dcc, html, no_update, ClientsideFunction, Input, Output, Patch, State
+import numpy as np
 import pandas as pd
-from services.db_utils import get_regular_market_data_by_security, get_regular_market_all_security_descriptions, get_regular_market_data_by_date
+import plotly.graph_objects as go
+from services.db_utils import (
+    get_query_cache_stats,
+    get_regular_market_daily_range_frame_cached,
+    get_regular_market_security_metadata_cached,
+    search_security_descriptions,
+)
+from services.downsample import downsample_indices
 from utils.logging import setup_logging
 from config.template import INDEX_STRING
 setup_logging()
 logger = logging.getLogger(__name__)
 
+# Options sent to the security dropdown per keystroke
+DROPDOWN_MATCH_LIMIT = 20
+# Chart traces are downsampled to about one point per pixel of chart width,
+# bounded so a very wide screen still gets a small payload
+DEFAULT_CHART_WIDTH = 1000
+MAX_CHART_POINTS = 4000
+# Markers are only drawn when the points are at least this many pixels apart
+MARKER_SPACING_PX = 12
+
+def series_figure(name, color, yaxis_title, hovertemplate):
+    """Static styling of a daily series chart, its data and title are filled in with Patch."""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=[],
+        y=[],
+        mode='lines+markers',
+        line=dict(color=color, width=3),
+        marker=dict(size=8, color=color, line=dict(width=2, color='white')),
+        name=name,
+        hovertemplate=hovertemplate
+    ))
+    
+    fig.update_layout(
+        title=dict(
+            text='',
+            font=dict(size=18, color='#333'),
+            x=0.5
+        ),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(family='Inter', color='#333'),
+        xaxis=dict(
+            gridcolor='#e2e8f0',
+            title='Date',
+            title_font=dict(size=12, color='#666'),
+            visible=False
+        ),
+        yaxis=dict(
+            gridcolor='#e2e8f0',
+            title=yaxis_title,
+            title_font=dict(size=12, color='#666'),
+            visible=False
+        ),
+        height=400,
+        hovermode='x unified'
+    )
+    return fig
+
+def message_annotations(title, subtitle=""):
+    annotations = [dict(
+        text=title,
+        x=0.5, y=0.6,
+        xref="paper", yref="paper",
+        font=dict(size=20, color="#666"),
+        showarrow=False
+    )]
+    if subtitle:
+        annotations.append(dict(
+            text=subtitle,
+            x=0.5, y=0.4,
+            xref="paper", yref="paper",
+            font=dict(size=14, color="#999"),
+            showarrow=False
+        ))
+    return annotations
+
+def chart_points(chart_width):
+    """Points kept per series for a chart `chart_width` pixels wide."""
+    return min(chart_width or DEFAULT_CHART_WIDTH, MAX_CHART_POINTS)
+
+def trace_points(dates, values, indices, chart_width):
+    """
+    The days at `indices` of a daily series, as trace data.
+
+    Returns:
+        tuple[list, list, str]: ISO dates, values and the trace mode
+    """
+    width = chart_width or DEFAULT_CHART_WIDTH
+    mode = 'lines+markers' if len(indices) * MARKER_SPACING_PX <= width else 'lines'
+    return np.datetime_as_string(dates[indices], unit='D').tolist(), values[indices].tolist(), mode
+
+def series_points(dates, values, chart_width):
+    """Downsample a daily series for a chart `chart_width` pixels wide, as trace data."""
+    return trace_points(dates, values, downsample_indices(dates, values, chart_points(chart_width)), chart_width)
+
+def trace_patch(x, y, mode):
+    """Replace only the trace data of a chart, its axes and zoom are kept."""
+    patch = Patch()
+    patch['data'][0]['x'] = x
+    patch['data'][0]['y'] = y
+    patch['data'][0]['mode'] = mode
+    return patch
+
+def series_patch(title, x, y, mode):
+    """Replace only the trace data and title of a chart built from a template."""
+    patch = trace_patch(x, y, mode)
+    patch['layout']['title']['text'] = title
+    patch['layout']['annotations'] = []
+    for axis in ('xaxis', 'yaxis'):
+        patch['layout'][axis]['visible'] = True
+        patch['layout'][axis]['autorange'] = True
+    return patch
+
+def message_patch(title, subtitle=""):
+    """Clear a chart built from a template and show a message instead."""
+    patch = Patch()
+    patch['data'][0]['x'] = []
+    patch['data'][0]['y'] = []
+    patch['layout']['title']['text'] = ''
+    patch['layout']['annotations'] = message_annotations(title, subtitle)
+    for axis in ('xaxis', 'yaxis'):
+        patch['layout'][axis]['visible'] = False
+    return patch
+
+# Built once, the callbacks only patch their data, title and messages
+TRADES_FIGURE = series_figure('Trades', '#667eea', 'Number of Trades', '<b>%{x}</b><br>Trades: %{y:,}<extra></extra>')
+TTA_FIGURE = series_figure('TTA', '#764ba2', 'Total Trading Amount ($)', '<b>%{x}</b><br>TTA: $%{y:,.0f}<extra></extra>')
+
 app = dash.Dash(__name__)
 server = app.server
 
@@ -53,16 +179,21 @@ app.layout = html.Div(className='main-container', children=[
         ])
     ]),
     
+    # Daily series of the selected security, filtered by date in the browser
+    dcc.Store(id='security-series'),
+    # Pixel width of the charts, measured in the browser on page load
+    dcc.Store(id='chart-width'),
+    
     # Summary Section
     html.Div(id='summary-box', className='summary-container'),
     
     # Charts Section
     html.Div(className='charts-container', children=[
         html.Div(className='chart-wrapper', children=[
-            dcc.Graph(id='trades-chart', config={'displayModeBar': False})
+            dcc.Graph(id='trades-chart', figure=TRADES_FIGURE, config={'displayModeBar': False})
         ]),
         html.Div(className='chart-wrapper', children=[
-            dcc.Graph(id='tta-chart', config={'displayModeBar': False})
+            dcc.Graph(id='tta-chart', figure=TTA_FIGURE, config={'displayModeBar': False})
         ])
     ]),
     
@@ -74,24 +205,29 @@ app.layout = html.Div(className='main-container', children=[
     )
 ])
 
-# Callback to populate dropdown
+# Callback to populate dropdown with the top matches of the typed text
 @app.callback(
     Output('security-dropdown', 'options'),
-    Input('security-dropdown', 'value')
+    Input('security-dropdown', 'search_value'),
+    State('security-dropdown', 'value')
 )
-def update_dropdown(_):
+def update_dropdown(search_value, selected_security):
     try:
-        descriptions = get_regular_market_all_security_descriptions()
+        descriptions = search_security_descriptions(search_value, DROPDOWN_MATCH_LIMIT)
+        # Keep the current selection in the options, or the dropdown would clear it
+        if selected_security and selected_security not in descriptions:
+            descriptions = [selected_security, *descriptions]
         return [{'label': desc, 'value': desc} for desc in descriptions]
     except Exception as e:
         logger.error(f"Error loading securities: {e}")
         return []
 
-# Callback to update figures and summary box
+# Callback to load a security: full daily series into the store, figures and date bounds.
+# Date range changes are handled in the browser by the clientside callback below.
 @app.callback(
     Output('trades-chart', 'figure'),
     Output('tta-chart', 'figure'),
-    Output('summary-box', 'children'),
+    Output('security-series', 'data'),
     Output('date-picker-range', 'min_date_allowed'),
     Output('date-picker-range', 'max_date_allowed'),
     Output('date-picker-range', 'start_date'),
@@ -99,41 +235,9 @@ def update_dropdown(_):
     Output('last-update-display', 'children'),
     Output('loading-output', 'children'),
     Input('security-dropdown', 'value'),
-    Input('date-picker-range', 'start_date'),
-    Input('date-picker-range', 'end_date'),
-    State('date-picker-range', 'min_date_allowed'),
-    State('date-picker-range', 'max_date_allowed')
+    State('chart-width', 'data')
 )
-def update_charts(selected_security, start_date, end_date, min_date_state, max_date_state):
-    ctx = dash.callback_context
-    triggered_id = ctx.triggered[0]['prop_id'].split('.')[0] if ctx.triggered else ''
-    
-    def create_empty_figure(title, subtitle=""):
-        fig = go.Figure()
-        fig.add_annotation(
-            text=title,
-            x=0.5, y=0.6,
-            xref="paper", yref="paper",
-            font=dict(size=20, color="#666"),
-            showarrow=False
-        )
-        if subtitle:
-            fig.add_annotation(
-                text=subtitle,
-                x=0.5, y=0.4,
-                xref="paper", yref="paper",
-                font=dict(size=14, color="#999"),
-                showarrow=False
-            )
-        fig.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            xaxis=dict(visible=False),
-            yaxis=dict(visible=False),
-            height=400
-        )
-        return fig
-    
+def update_charts(selected_security, chart_width):
     # Default last update display
     default_last_update = [
         html.Div("🕐", className='last-update-icon'),
@@ -142,177 +246,159 @@ def update_charts(selected_security, start_date, end_date, min_date_state, max_d
     ]
     
     if not selected_security:
-        empty_fig = create_empty_figure("📊 Select a security to view analytics", "Choose from the dropdown above to get started")
-        return empty_fig, empty_fig, [], None, None, None, None, default_last_update, ""
+        empty_fig = message_patch("📊 Select a security to view analytics", "Choose from the dropdown above to get started")
+        return empty_fig, empty_fig, None, None, None, None, None, default_last_update, ""
     
     try:
-        market_data = get_regular_market_data_by_security(selected_security)
-        
-        if not market_data:
-            empty_fig = create_empty_figure(f"📭 No data available", f"No market data found for {selected_security}")
-            return empty_fig, empty_fig, [], None, None, None, None, default_last_update, ""
+        # Date bounds and latest row come from two index seeks
+        metadata = get_regular_market_security_metadata_cached(selected_security)
         
-        df = pd.DataFrame([vars(s) for s in market_data])
-        df['datetime'] = pd.to_datetime(df['timestamp'])
-        df['date'] = df['datetime'].dt.date
+        if metadata is None:
+            empty_fig = message_patch(f"📭 No data available", f"No market data found for {selected_security}")
+            return empty_fig, empty_fig, None, None, None, None, None, default_last_update, ""
         
-        min_date = df['date'].min()
-        max_date = df['date'].max()
+        min_date = metadata['min_date']
+        max_date = metadata['max_date']
         
-        # Update date picker range only when security changes
-        if triggered_id == 'security-dropdown':
-            start_date = min_date
-            end_date = max_date
-        else:
-            start_date = start_date or min_date_state
-            end_date = end_date or max_date_state
+        # One pre-aggregated row per day, already ordered by date, as typed columns.
+        # The frame is shared through the query cache, read it without modifying it.
+        daily_df = get_regular_market_daily_range_frame_cached(selected_security, min_date, max_date)
+        trade_dates = daily_df['trade_date'].to_numpy()
+        trades = daily_df['trades'].to_numpy()
+        tta = daily_df['tta'].to_numpy()
         
-        # Filter dataframe based on date picker
-        if start_date and end_date:
-            df_filtered = df[(df['date'] >= pd.to_datetime(start_date).date()) & (df['date'] <= pd.to_datetime(end_date).date())]
-        else:
-            df_filtered = df
-        
-        if df_filtered.empty:
-            empty_fig = create_empty_figure("📅 No data in selected range", "Try adjusting your date range")
-            return empty_fig, empty_fig, [], min_date, max_date, start_date, end_date, default_last_update, ""
+        # The charts get at most one point per pixel, picked by LTTB
+        trades_kept = downsample_indices(trade_dates, trades, chart_points(chart_width))
+        tta_kept = downsample_indices(trade_dates, tta, chart_points(chart_width))
         
         # Get latest data for summary
-        latest_data = df.loc[df['datetime'].idxmax()]
+        latest_data = metadata['latest']
         
         last_update_display = [
             html.Div("🕐", className='last-update-icon'),
-            html.Div(latest_data['datetime'].strftime('%m/%d/%y %H:%M'), className='last-update-value'),
+            html.Div(latest_data.timestamp.strftime('%m/%d/%y %H:%M'), className='last-update-value'),
             html.Div("Last Update", className='last-update-label')
         ]
         
-        #  Additional metrics
-        total_trades = df_filtered['trades'].sum()
-        total_tta = df_filtered['tta'].sum()
-        price_change = df_filtered['ltp'].iloc[-1] - df_filtered['ltp'].iloc[0] if len(df_filtered) > 1 else 0
+        # Sent to the browser once per security, the date range is applied clientside.
+        # Every day is sent, so the range totals are exact sums over the picked days
+        # (a few kB per year of history) and the traces can be rebuilt for any range.
+        series = {
+            'security': selected_security,
+            'date': np.datetime_as_string(trade_dates, unit='D').tolist(),
+            'trades': trades.tolist(),
+            'tta': tta.tolist(),
+            'ltp': daily_df['ltp'].to_numpy().tolist(),
+            'latest': {'ltp': latest_data.ltp, 'high': latest_data.high, 'low': latest_data.low},
+            # The traces are resampled in the browser for each picked range
+            'max_points': chart_points(chart_width),
+            'marker_points': (chart_width or DEFAULT_CHART_WIDTH) // MARKER_SPACING_PX,
+        }
         
-        # Create summary cards
-        summary_children = [
-            html.H3("📊 Market Overview", style={'color': '#333', 'marginBottom': '20px', 'fontSize': '1.5rem'}),
-            html.Div(className='summary-grid', children=[
-                html.Div(className='summary-card', children=[
-                    html.Div("💰", className='summary-card-icon'),
-                    html.Div(f"${latest_data['ltp']:.2f}", className='summary-card-value'),
-                    html.Div("Last Traded Price", className='summary-card-label')
-                ]),
-                html.Div(className='summary-card', children=[
-                    html.Div("📈", className='summary-card-icon'),
-                    html.Div(f"${latest_data['high']:.2f}", className='summary-card-value'),
-                    html.Div("Day High", className='summary-card-label')
-                ]),
-                html.Div(className='summary-card', children=[
-                    html.Div("📉", className='summary-card-icon'),
-                    html.Div(f"${latest_data['low']:.2f}", className='summary-card-value'),
-                    html.Div("Day Low", className='summary-card-label')
-                ]),
-                html.Div(className='summary-card', children=[
-                    html.Div("🔄", className='summary-card-icon'),
-                    html.Div(f"{total_trades:,}", className='summary-card-value'),
-                    html.Div("Total Trades", className='summary-card-label')
-                ]),
-                html.Div(className='summary-card', children=[
-                    html.Div("📊", className='summary-card-icon'),
-                    html.Div(f"${total_tta:,.0f}", className='summary-card-value'),
-                    html.Div("Total TTA", className='summary-card-label')
-                ]),
-                html.Div(className='summary-card', children=[
-                    html.Div("↕️", className='summary-card-icon'),
-                    html.Div(f"${price_change:+.2f}", className='summary-card-value'),
-                    html.Div("Price Change", className='summary-card-label')
-                ])
-            ])
-        ]
+        trades_fig = series_patch(f'📈 Daily Trades - {selected_security}', *trace_points(trade_dates, trades, trades_kept, chart_width))
+        tta_fig = series_patch(f'💼 Daily TTA - {selected_security}', *trace_points(trade_dates, tta, tta_kept, chart_width))
         
-        # Group by date and aggregate
-        daily_df = df_filtered.groupby('date').agg(
-            trades=('trades', 'sum'),
-            tta=('tta', 'sum'),
-            high=('high', 'max'),
-            low=('low', 'min'),
-            ltp=('ltp', 'last')
-        ).reset_index()
+        return trades_fig, tta_fig, series, min_date, max_date, min_date, max_date, last_update_display, ""
         
-        # Create trades chart
-        trades_fig = go.Figure()
-        trades_fig.add_trace(go.Scatter(
-            x=daily_df['date'],
-            y=daily_df['trades'],
-            mode='lines+markers',
-            line=dict(color='#667eea', width=3),
-            marker=dict(size=8, color='#667eea', line=dict(width=2, color='white')),
-            name='Trades',
-            hovertemplate='<b>%{x}</b><br>Trades: %{y:,}<extra></extra>'
-        ))
-        
-        trades_fig.update_layout(
-            title=dict(
-                text=f'📈 Daily Trades - {selected_security}',
-                font=dict(size=18, color='#333'),
-                x=0.5
-            ),
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(family='Inter', color='#333'),
-            xaxis=dict(
-                gridcolor='#e2e8f0',
-                title='Date',
-                title_font=dict(size=12, color='#666')
-            ),
-            yaxis=dict(
-                gridcolor='#e2e8f0',
-                title='Number of Trades',
-                title_font=dict(size=12, color='#666')
-            ),
-            height=400,
-            hovermode='x unified'
-        )
-        
-        # Create TTA chart
-        tta_fig = go.Figure()
-        tta_fig.add_trace(go.Scatter(
-            x=daily_df['date'],
-            y=daily_df['tta'],
-            mode='lines+markers',
-            line=dict(color='#764ba2', width=3),
-            marker=dict(size=8, color='#764ba2', line=dict(width=2, color='white')),
-            name='TTA',
-            hovertemplate='<b>%{x}</b><br>TTA: $%{y:,.0f}<extra></extra>'
-        ))
+    except Exception as e:
+        logger.error(f"Error updating charts: {e}")
+        error_fig = message_patch("⚠️ Error loading data", "Please try again or contact support")
+        return error_fig, error_fig, None, None, None, None, None, default_last_update, ""
+
+# Date range filtering, trace resampling, summary cards and axis ranges run in the browser
+# (assets/dashboard.js), so a picker change rebuilds the traces even after a zoom
+app.clientside_callback(
+    ClientsideFunction(namespace='dashboard', function_name='applyDateRange'),
+    Output('trades-chart', 'figure', allow_duplicate=True),
+    Output('tta-chart', 'figure', allow_duplicate=True),
+    Output('summary-box', 'children'),
+    Input('security-series', 'data'),
+    Input('date-picker-range', 'start_date'),
+    Input('date-picker-range', 'end_date'),
+    State('trades-chart', 'figure'),
+    State('tta-chart', 'figure'),
+    prevent_initial_call=True
+)
+
+app.clientside_callback(
+    ClientsideFunction(namespace='dashboard', function_name='chartWidth'),
+    Output('chart-width', 'data'),
+    Input('trades-chart', 'id')
+)
+
+def relayout_x_range(relayout_data):
+    """
+    X range of a zoom or pan event of a chart.
+
+    Returns:
+        tuple | None: (start, end) strings, (None, None) when the zoom was reset, None for other events
+    """
+    if not relayout_data:
+        return None
+    if relayout_data.get('xaxis.autorange'):
+        return None, None
+    if 'xaxis.range[0]' in relayout_data and 'xaxis.range[1]' in relayout_data:
+        return relayout_data['xaxis.range[0]'], relayout_data['xaxis.range[1]']
+    if 'xaxis.range' in relayout_data:
+        return tuple(relayout_data['xaxis.range'])
+    return None
+
+# Callback to resample a chart for its visible range: zooming in brings back every day
+# once few enough of them are visible. Date picker changes stay in the browser.
+@app.callback(
+    Output('trades-chart', 'figure', allow_duplicate=True),
+    Output('tta-chart', 'figure', allow_duplicate=True),
+    Input('trades-chart', 'relayoutData'),
+    Input('tta-chart', 'relayoutData'),
+    State('date-picker-range', 'start_date'),
+    State('date-picker-range', 'end_date'),
+    State('security-dropdown', 'value'),
+    State('chart-width', 'data'),
+    prevent_initial_call=True
+)
+def resample_charts(trades_relayout, tta_relayout, start_date, end_date, selected_security, chart_width):
+    if not selected_security:
+        return no_update, no_update
+    
+    # A zoom only resamples the chart it happened on
+    charts = {'trades-chart': ('trades', trades_relayout), 'tta-chart': ('tta', tta_relayout)}
+    if ctx.triggered_id not in charts:
+        return no_update, no_update
+    column, relayout_data = charts[ctx.triggered_id]
+    visible = relayout_x_range(relayout_data)
+    if visible is None:
+        return no_update, no_update
+    if visible == (None, None):
+        # Zoom reset, back to the date picker range
+        visible = (start_date, end_date)
+    
+    try:
+        metadata = get_regular_market_security_metadata_cached(selected_security)
+        if metadata is None:
+            return no_update, no_update
         
-        tta_fig.update_layout(
-            title=dict(
-                text=f'💼 Daily TTA - {selected_security}',
-                font=dict(size=18, color='#333'),
-                x=0.5
-            ),
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(family='Inter', color='#333'),
-            xaxis=dict(
-                gridcolor='#e2e8f0',
-                title='Date',
-                title_font=dict(size=12, color='#666')
-            ),
-            yaxis=dict(
-                gridcolor='#e2e8f0',
-                title='Total Trading Amount ($)',
-                title_font=dict(size=12, color='#666')
-            ),
-            height=400,
-            hovermode='x unified'
-        )
+        # Sliced from the full history already in the query cache, no new query per zoom
+        daily_df = get_regular_market_daily_range_frame_cached(selected_security, metadata['min_date'], metadata['max_date'])
+        trade_dates = daily_df['trade_date'].to_numpy()
+        if not len(trade_dates):
+            return no_update, no_update
+        start = pd.Timestamp(visible[0]).to_datetime64() if visible[0] else trade_dates[0]
+        end = pd.Timestamp(visible[1]).to_datetime64() if visible[1] else trade_dates[-1]
+        # One day beyond each edge, so the line runs to the sides of the chart
+        first = max(int(np.searchsorted(trade_dates, start, side='left')) - 1, 0)
+        last = int(np.searchsorted(trade_dates, end, side='right')) + 1
         
-        return trades_fig, tta_fig, summary_children, min_date, max_date, start_date, end_date, last_update_display, ""
+        patch = trace_patch(*series_points(trade_dates[first:last], daily_df[column].to_numpy()[first:last], chart_width))
+        return (patch, no_update) if column == 'trades' else (no_update, patch)
         
     except Exception as e:
-        logger.error(f"Error updating charts: {e}")
-        error_fig = create_empty_figure("⚠️ Error loading data", "Please try again or contact support")
-        return error_fig, error_fig, [], None, None, None, None, default_last_update, ""
+        logger.error(f"Error resampling charts: {e}")
+        return no_update, no_update
+
+@server.route('/cache-stats')
+def cache_stats():
+    """Hit/miss counts of the dashboard query cache."""
+    return flask.jsonify(get_query_cache_stats())
 
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
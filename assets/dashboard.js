@@ -0,0 +1,185 @@
+// Clientside callbacks of app.py. The selected security's daily series is
+// loaded once into the `security-series` store; moving the date picker only runs this code,
+// which also resamples the traces for the picked range.
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    dashboard: {
+        // Pixel width of the charts, the server downsamples the traces to it
+        chartWidth: function () {
+            const graph = document.getElementById('trades-chart');
+            return graph && graph.clientWidth ? graph.clientWidth : window.dash_clientside.no_update;
+        },
+
+        applyDateRange: function (series, startDate, endDate, tradesFig, ttaFig) {
+            const noUpdate = window.dash_clientside.no_update;
+            if (!series || !series.date.length) {
+                return [noUpdate, noUpdate, []];
+            }
+
+            // Picker values are 'YYYY-MM-DD' or ISO datetimes, compare them as day strings
+            const start = (startDate || series.date[0]).slice(0, 10);
+            const end = (endDate || series.date[series.date.length - 1]).slice(0, 10);
+            const visible = [];
+            series.date.forEach(function (day, i) {
+                if (day >= start && day <= end) {
+                    visible.push(i);
+                }
+            });
+
+            if (!visible.length) {
+                const message = {
+                    text: '📅 No data in selected range', x: 0.5, y: 0.5,
+                    xref: 'paper', yref: 'paper', showarrow: false,
+                    font: {size: 20, color: '#666'}
+                };
+                return [
+                    withRange(tradesFig, start, end, null, [message]),
+                    withRange(ttaFig, start, end, null, [message]),
+                    []
+                ];
+            }
+
+            const pick = function (column) {
+                return visible.map(function (i) { return series[column][i]; });
+            };
+            // One day beyond each edge, so the lines run to the sides of the charts
+            const traceStart = Math.max(visible[0] - 1, 0);
+            const traceEnd = Math.min(visible[visible.length - 1] + 2, series.date.length);
+            const trace = function (column) {
+                return rangeTrace(series, column, traceStart, traceEnd);
+            };
+            const trades = pick('trades');
+            const tta = pick('tta');
+            const ltp = pick('ltp');
+
+            // The store holds every day, so the totals are exact
+            const sum = function (values) {
+                return values.reduce(function (total, value) { return total + value; }, 0);
+            };
+            const totalTrades = sum(trades);
+            const totalTta = sum(tta);
+            const priceChange = ltp.length > 1 ? ltp[ltp.length - 1] - ltp[0] : 0;
+            const latest = series.latest;
+
+            const summary = [
+                component('H3', {
+                    children: '📊 Market Overview',
+                    style: {color: '#333', marginBottom: '20px', fontSize: '1.5rem'}
+                }),
+                component('Div', {className: 'summary-grid', children: [
+                    card('💰', '$' + latest.ltp.toFixed(2), 'Last Traded Price'),
+                    card('📈', '$' + latest.high.toFixed(2), 'Day High'),
+                    card('📉', '$' + latest.low.toFixed(2), 'Day Low'),
+                    card('🔄', totalTrades.toLocaleString('en-US'), 'Total Trades'),
+                    card('📊', '$' + Math.round(totalTta).toLocaleString('en-US'), 'Total TTA'),
+                    card('↕️', '$' + (priceChange >= 0 ? '+' : '') + priceChange.toFixed(2), 'Price Change')
+                ]})
+            ];
+
+            return [
+                withRange(tradesFig, start, end, paddedRange(trades), [], trace('trades')),
+                withRange(ttaFig, start, end, paddedRange(tta), [], trace('tta')),
+                summary
+            ];
+        }
+    }
+});
+
+function component(type, props) {
+    return {type: type, namespace: 'dash_html_components', props: props};
+}
+
+function card(icon, value, label) {
+    return component('Div', {className: 'summary-card', children: [
+        component('Div', {children: icon, className: 'summary-card-icon'}),
+        component('Div', {children: value, className: 'summary-card-value'}),
+        component('Div', {children: label, className: 'summary-card-label'})
+    ]});
+}
+
+// Y range of the visible points, with the margin Plotly's autorange would add
+function paddedRange(values) {
+    const low = Math.min.apply(null, values);
+    const high = Math.max.apply(null, values);
+    const pad = (high - low) * 0.08 || Math.abs(high) * 0.08 || 1;
+    return [low - pad, high + pad];
+}
+
+// Copy of a figure zoomed on [start, end], with its trace data replaced when `trace` is given
+function withRange(figure, start, end, yRange, annotations, trace) {
+    const layout = Object.assign({}, figure.layout);
+    layout.xaxis = Object.assign({}, layout.xaxis, {range: [start, end], autorange: false});
+    layout.yaxis = yRange
+        ? Object.assign({}, layout.yaxis, {range: yRange, autorange: false})
+        : Object.assign({}, layout.yaxis, {autorange: true});
+    layout.annotations = annotations;
+    const data = trace
+        ? [Object.assign({}, figure.data[0], trace)].concat(figure.data.slice(1))
+        : figure.data;
+    return Object.assign({}, figure, {data: data, layout: layout});
+}
+
+// Trace data of the days first to end - 1 of a store column, downsampled like the
+// server does (services/downsample.py) to the store's `max_points`
+function rangeTrace(series, column, first, end) {
+    const dates = series.date.slice(first, end);
+    const values = series[column].slice(first, end);
+    const kept = lttbIndices(dates.map(function (day) { return Date.parse(day); }), values, series.max_points);
+    return {
+        x: kept.map(function (i) { return dates[i]; }),
+        y: kept.map(function (i) { return values[i]; }),
+        mode: kept.length <= series.marker_points ? 'lines+markers' : 'lines'
+    };
+}
+
+// Port of `lttb_indices` in services/downsample.py: the same buckets and the same kept points
+function lttbIndices(x, y, threshold) {
+    const n = y.length;
+    const all = function () {
+        return Array.from({length: n}, function (_, i) { return i; });
+    };
+    if (threshold >= n || threshold < 3) {
+        return all();
+    }
+
+    // Bucket i holds the points edges[i] to edges[i + 1] - 1
+    const edges = [];
+    const step = (n - 2) / (threshold - 2);
+    for (let i = 0; i < threshold - 1; i++) {
+        edges.push(i === threshold - 2 ? n - 1 : Math.floor(1 + i * step));
+    }
+    const averages = [];
+    for (let bucket = 0; bucket < threshold - 2; bucket++) {
+        let sumX = 0;
+        let sumY = 0;
+        for (let i = edges[bucket]; i < edges[bucket + 1]; i++) {
+            sumX += x[i];
+            sumY += y[i];
+        }
+        const count = edges[bucket + 1] - edges[bucket];
+        averages.push([sumX / count, sumY / count]);
+    }
+
+    const kept = [0];
+    let previous = 0;
+    for (let bucket = 0; bucket < threshold - 2; bucket++) {
+        // Third vertex: the next bucket's average, the last point for the last bucket
+        const next = bucket + 1 < averages.length ? averages[bucket + 1] : [x[n - 1], y[n - 1]];
+        let best = edges[bucket];
+        let bestArea = -1;
+        for (let i = edges[bucket]; i < edges[bucket + 1]; i++) {
+            // Twice the triangle area, the factor does not change the largest one
+            const area = Math.abs(
+                (x[previous] - next[0]) * (y[i] - y[previous])
+                - (x[previous] - x[i]) * (next[1] - y[previous])
+            );
+            if (area > bestArea) {
+                best = i;
+                bestArea = area;
+            }
+        }
+        kept.push(best);
+        previous = best;
+    }
+    kept.push(n - 1);
+    return kept;
+}
@@ -0,0 +1,37 @@
+import multiprocessing
+import os
+import tempfile
+
+# Production server: gunicorn -c gunicorn.conf.py app:server
+# Sizes are read from the environment so they can be tuned per App Service plan.
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", min(2 * multiprocessing.cpu_count() + 1, 8)))
+threads = int(os.getenv("WEB_THREADS", "4"))
+worker_class = "gthread"
+timeout = int(os.getenv("WEB_TIMEOUT", "120"))
+keepalive = 5
+# Workers are recycled now and then, the shared query cache outlives them
+max_requests = 1000
+max_requests_jitter = 100
+accesslog = "-"
+
+# Import the app once in the master and fork the workers from it
+preload_app = True
+
+# Azure SQL connection budget of the whole host, split between the workers.
+# Each worker thread holds at most one connection, the rest of the share is overflow.
+db_connections_per_worker = max(1, int(os.getenv("DB_MAX_CONNECTIONS", "30")) // workers)
+os.environ.setdefault("DB_POOL_SIZE", str(min(threads, db_connections_per_worker)))
+os.environ.setdefault("DB_MAX_OVERFLOW", str(max(0, db_connections_per_worker - threads)))
+
+# Workers share query results through a SQLite file in CACHE_DIR. SQLite WAL needs
+# local shared memory, and the app directory of Azure App Service is a network share.
+os.environ.setdefault("SHARED_QUERY_CACHE", "true")
+os.environ.setdefault("CACHE_DIR", os.path.join(tempfile.gettempdir(), "modular_am"))
+
+
+def post_fork(server, worker):
+    # Connections opened by the master while preloading must not be shared with workers
+    from setting.sqlalchemy_config import ENGINE
+    ENGINE.dispose(close=False)
@@ -1,5 +1,9 @@
+import asyncio
+import datetime
 import logging
-from services.scrape import scrape_table
+import httpx
+from services.archive import archive_snapshot
+from services.scrape import TABLE_ENDPOINTS, scrape_tables_async
 from services.db_utils import insert_regular_market
 from utils.logging import setup_logging
 
@@ -9,36 +13,50 @@ logger = logging.getLogger(__name__)
 
 URL = "https://www.ccilindia.com/web/ccil/rbi-nds-om1"
 TABLE = "ndsomEntityTable"
+TABLES = list(TABLE_ENDPOINTS)
+
+# Tables stored in regular_market. The other CCIL tables share security names
+# with NDS-OM, so they are scraped but not written to the same table.
+INGEST_TABLES = {TABLE}
 
-RESPONSE_HEADER_MAPPING = {
-    "ismt_idntr": "Security Description",
-    "ttc": "Trades",
-    "tta": "TTA",
-    "op": "Open",
-    "hi": "High",
-    "lo": "Low",
-    "ltp": "LTP",
-    "arrow": "Arrow",
-    "indicator": "Indicator",
-    "lty": "LTY",
-    "prev_trad_rate": "Previous Trade Rate",
-    "trade_yeild": "Trade Yield",
-    "mrkt_indc": "Market Indicator",
-    "book_indc": "Book Indicator"
-}
  
-def main():
+async def run_increment(client: httpx.AsyncClient | None = None) -> dict[str, dict[str, int]]:
+    """
+    Scrape all tables concurrently and insert each one into the database as it arrives.
+
+    Args:
+        client (httpx.AsyncClient | None): Client to reuse across runs, e.g. by the ingest daemon
+
+    Returns:
+        dict[str, dict[str, int]]: Ingest counts per stored table
+    """
+    ingest_counts = {}
+
+    def ingest(table_name: str, scraped_data: list[dict]):
+        if not scraped_data:
+            logger.warning(f"No data scraped from {table_name} at {URL}.")
+            return
+        scraped_at = datetime.datetime.now()
+        archive_snapshot(table_name, scraped_data, scraped_at)
+        if table_name in INGEST_TABLES:
+            counts = insert_regular_market(scraped_data, timestamp=scraped_at)
+            ingest_counts[table_name] = counts
+            logger.info(f"Ingest of {table_name} finished: {counts['inserted']} inserted, {counts['updated']} updated, {counts['unchanged']} unchanged.")
+        else:
+            logger.info(f"Archived {len(scraped_data)} rows from {table_name}, no ingest target.")
+
+    logger.info("Start scraping...")
+    # Tables whose payload did not change since the last run are skipped before parsing
+    scraped = await scrape_tables_async(url=URL, table_names=TABLES, on_result=ingest, client=client, skip_unchanged=True)
+    logger.info(f"Scrape finished, {len(scraped)}/{len(TABLES)} tables returned new data.")
+    return ingest_counts
+
+def main() -> dict[str, dict[str, int]]:
     """
     Main function to perform update.
     Scrapes data and inserts it into the database.
     """
-    logger.info("Start scraping...")
-    scraped_data = scrape_table(url=URL, table_name=TABLE, method='direct')
-    logger.info("Scrape finished.")
-    if scraped_data:
-        insert_regular_market(scraped_data)
-    else:
-        logger.warning(f"No data scraped from {TABLE} at {URL}.")
+    return asyncio.run(run_increment())
 
 if __name__ == "__main__":
     main()
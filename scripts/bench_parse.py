@@ -0,0 +1,52 @@
+import argparse
+import logging
+import time
+from pathlib import Path
+from services.scrape import TABLE_PARSERS, TABLE_TAB_MAPPING, extract_table_data
+from utils.logging import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+FIXTURE = Path(__file__).resolve().parent.parent / "test_file" / "test.html"
+
+
+def bench(content: str, table_name: str, parser: str, repeat: int) -> tuple[float, list[dict]]:
+    """Best of `repeat` parse times of one table page, in seconds, and the parsed rows."""
+    best, rows = float("inf"), []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = extract_table_data(content, table_name, parser=parser)
+        best = min(best, time.perf_counter() - started)
+    return best, rows
+
+
+def main():
+    """
+    Compare the extract_table_data parsers on a saved CCIL page.
+    Usage: python -m scripts.bench_parse --repeat 20
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--file", type=Path, default=FIXTURE)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    # Skipped-row warnings are repeated on every run, only keep the timings
+    logging.getLogger("services.scrape").setLevel(logging.ERROR)
+    content = args.file.read_text(encoding="utf-8")
+    logger.info(f"Parsing {args.file} ({len(content) / 1024:.0f} KiB), best of {args.repeat} runs")
+    for table_name in TABLE_TAB_MAPPING:
+        timings, outputs = {}, {}
+        for name in TABLE_PARSERS:
+            timings[name], outputs[name] = bench(content, table_name, name, args.repeat)
+        reference = outputs["html.parser"]
+        for name, rows in outputs.items():
+            if rows != reference:
+                raise AssertionError(f"Parser '{name}' output differs from html.parser on '{table_name}'")
+        summary = ", ".join(
+            f"{name} {seconds * 1000:.1f} ms (x{timings['html.parser'] / seconds:.1f})" for name, seconds in timings.items()
+        )
+        logger.info(f"{table_name}: {len(reference)} rows, {summary}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import datetime
+import logging
+import sys
+import xml.etree.ElementTree as ET
+from sqlalchemy.dialects import mssql
+from setting.sqlalchemy_config import ENGINE
+from services.db_utils import (
+    latest_regular_market_by_security_query,
+    latest_regular_market_query,
+    regular_market_date_bounds_query,
+    regular_market_daily_by_security_query,
+    regular_market_daily_range_query,
+    regular_market_by_date_query,
+    regular_market_by_security_query,
+    regular_market_ticks_by_security_query,
+)
+from utils.logging import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+SHOWPLAN_NS = {"sp": "http://schemas.microsoft.com/sqlserver/2004/07/showplan"}
+
+FULL_SCANS = {"Table Scan", "Clustered Index Scan"}
+SCANS_AND_SORTS = FULL_SCANS | {"Index Scan", "Sort"}
+
+SAMPLE_SECURITY = "7.18% GS 2033"
+SAMPLE_DATE = datetime.date.today()
+
+# (name, query, operators that must not appear in the plan)
+PLAN_CHECKS = [
+    ("regular_market_by_security", regular_market_by_security_query(SAMPLE_SECURITY), SCANS_AND_SORTS),
+    ("regular_market_daily_by_security", regular_market_daily_by_security_query(SAMPLE_SECURITY), SCANS_AND_SORTS),
+    ("regular_market_by_date", regular_market_by_date_query(SAMPLE_DATE), SCANS_AND_SORTS),
+    (
+        "regular_market_daily_range",
+        regular_market_daily_range_query(SAMPLE_SECURITY, SAMPLE_DATE - datetime.timedelta(days=90), SAMPLE_DATE),
+        SCANS_AND_SORTS,
+    ),
+    ("regular_market_date_bounds", regular_market_date_bounds_query(SAMPLE_SECURITY), SCANS_AND_SORTS),
+    ("latest_regular_market_by_security", latest_regular_market_by_security_query(SAMPLE_SECURITY), SCANS_AND_SORTS),
+    (
+        "regular_market_ticks_by_security",
+        regular_market_ticks_by_security_query(SAMPLE_SECURITY, SAMPLE_DATE - datetime.timedelta(days=90), SAMPLE_DATE),
+        SCANS_AND_SORTS,
+    ),
+    # Reads every security by design, but must stream the covering index in order
+    ("latest_regular_market", latest_regular_market_query(), FULL_SCANS | {"Sort"}),
+]
+
+
+def capture_plan(sql: str) -> str:
+    """
+    Return the estimated XML plan of a statement without executing it.
+
+    Args:
+        sql (str): Statement with literal parameters
+
+    Returns:
+        str: SHOWPLAN_XML document
+    """
+    with ENGINE.connect() as connection:
+        connection.exec_driver_sql("SET SHOWPLAN_XML ON")
+        try:
+            return connection.exec_driver_sql(sql).scalar()
+        finally:
+            connection.exec_driver_sql("SET SHOWPLAN_XML OFF")
+
+
+def plan_operators(plan_xml: str) -> list[tuple[str, str]]:
+    """List the (physical operator, object) pairs of a plan."""
+    operators = []
+    for rel_op in ET.fromstring(plan_xml).iter(f"{{{SHOWPLAN_NS['sp']}}}RelOp"):
+        obj = rel_op.find("./*/sp:Object", SHOWPLAN_NS)
+        target = ""
+        if obj is not None:
+            target = f"{obj.get('Table', '')}.{obj.get('Index', '')}"
+        operators.append((rel_op.get("PhysicalOp"), target))
+    return operators
+
+
+def main() -> int:
+    """
+    Capture the plans of the db_utils read helpers and fail on scans or sorts.
+    Run it after schema or query changes: `python -m scripts.check_query_plans`.
+    """
+    failures = 0
+    for name, query, forbidden in PLAN_CHECKS:
+        sql = str(query.compile(dialect=mssql.dialect(), compile_kwargs={"literal_binds": True}))
+        operators = plan_operators(capture_plan(sql))
+        violations = [(op, target) for op, target in operators if op in forbidden]
+        if violations:
+            failures += 1
+            logger.error(f"{name}: forbidden operators in plan: {violations}")
+        else:
+            logger.info(f"{name}: OK {operators}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
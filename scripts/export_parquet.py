@@ -0,0 +1,22 @@
+import argparse
+import logging
+from services.parquet_store import export_all
+from utils.logging import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """
+    Incrementally export regular_market and regular_market_ticks to date-partitioned Parquet.
+    Pass --full to rewrite every partition, e.g. after an archive replay.
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--full", action="store_true")
+    args = parser.parse_args()
+    partitions = export_all(full=args.full)
+    logger.info(f"Parquet export finished: {partitions}")
+
+if __name__ == "__main__":
+    main()
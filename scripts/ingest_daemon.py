@@ -0,0 +1,136 @@
+import asyncio
+import datetime
+import logging
+import os
+import signal
+from pathlib import Path
+from zoneinfo import ZoneInfo
+from scripts.backfill_increment import run_increment
+from setting import config
+from utils.client import new_async_client
+from utils.logging import setup_logging
+from utils.state import load_json_state, save_json_state
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+MARKET_TZ = ZoneInfo("Asia/Kolkata")
+# NDS-OM trading session, Monday to Friday
+MARKET_OPEN = datetime.time(9, 0)
+MARKET_CLOSE = datetime.time(17, 0)
+
+MIN_INTERVAL = 60
+MARKET_INTERVAL = 300
+OFF_HOURS_INTERVAL = 3600
+
+STATUS_FILE = "ingest_daemon_status.json"
+
+
+def is_market_open(now: datetime.datetime) -> bool:
+    local = now.astimezone(MARKET_TZ)
+    return local.weekday() < 5 and MARKET_OPEN <= local.time() < MARKET_CLOSE
+
+
+def seconds_until_open(now: datetime.datetime) -> float:
+    """Seconds until the next session opens, 0 when the market is open."""
+    local = now.astimezone(MARKET_TZ)
+    if is_market_open(local):
+        return 0.0
+    day = local.date()
+    if local.time() >= MARKET_CLOSE:
+        day += datetime.timedelta(days=1)
+    while day.weekday() >= 5:
+        day += datetime.timedelta(days=1)
+    next_open = datetime.datetime.combine(day, MARKET_OPEN, tzinfo=MARKET_TZ)
+    return (next_open - local).total_seconds()
+
+
+class AdaptivePollSchedule:
+    """
+    Poll interval that halves while data keeps changing and doubles back to
+    MARKET_INTERVAL once it is quiet. Outside trading hours it sleeps until
+    the next open, polling at most every OFF_HOURS_INTERVAL for late prints.
+    """
+
+    def __init__(self):
+        self.interval = MARKET_INTERVAL
+
+    def next_interval(self, now: datetime.datetime, changed_rows: int) -> float:
+        if not is_market_open(now):
+            self.interval = MARKET_INTERVAL
+            return max(MIN_INTERVAL, min(OFF_HOURS_INTERVAL, seconds_until_open(now)))
+        if changed_rows:
+            self.interval = max(MIN_INTERVAL, self.interval // 2)
+        else:
+            self.interval = min(MARKET_INTERVAL, self.interval * 2)
+        return self.interval
+
+
+def read_status() -> dict:
+    """Return the last heartbeat written by the daemon."""
+    settings = config.get_settings()
+    return load_json_state(Path(settings.cache_dir) / STATUS_FILE, default={})
+
+
+async def run_daemon() -> None:
+    """
+    Keep one process, one DB pool and one HTTP client alive and poll on an
+    adaptive, market-hours-aware schedule instead of an hourly cron.
+    """
+    settings = config.get_settings()
+    status_path = Path(settings.cache_dir) / STATUS_FILE
+    schedule = AdaptivePollSchedule()
+    stop = asyncio.Event()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    status = {
+        "pid": os.getpid(),
+        "started_at": datetime.datetime.now().isoformat(),
+        "polls": 0,
+        "failures": 0,
+        "state": "running",
+    }
+
+    async with new_async_client() as client:
+        while not stop.is_set():
+            now = datetime.datetime.now(MARKET_TZ)
+            changed_rows = 0
+            status["polls"] += 1
+            status["last_poll_at"] = now.isoformat()
+            try:
+                counts = await run_increment(client=client)
+                changed_rows = sum(c["inserted"] + c["updated"] for c in counts.values())
+                status["last_success_at"] = datetime.datetime.now(MARKET_TZ).isoformat()
+                status["last_counts"] = counts
+                status["last_error"] = None
+            except Exception as e:
+                logger.error(f"Ingest poll failed: {e}")
+                status["failures"] += 1
+                status["last_error"] = str(e)
+
+            interval = schedule.next_interval(datetime.datetime.now(MARKET_TZ), changed_rows)
+            status["market_open"] = is_market_open(now)
+            status["interval_seconds"] = interval
+            status["next_poll_at"] = (datetime.datetime.now(MARKET_TZ) + datetime.timedelta(seconds=interval)).isoformat()
+            save_json_state(status_path, status)
+            logger.info(f"Next poll in {interval:.0f}s ({changed_rows} rows changed).")
+
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+
+    status["state"] = "stopped"
+    status["stopped_at"] = datetime.datetime.now(MARKET_TZ).isoformat()
+    save_json_state(status_path, status)
+    logger.info("Ingest daemon stopped.")
+
+
+def main():
+    asyncio.run(run_daemon())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import argparse
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import httpx
+from utils.logging import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+# One log line per request would slow the load generator down
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+ROOT = Path(__file__).resolve().parent.parent
+# Width the browser would report for the charts, the app downsamples to it
+CHART_WIDTH = 1000
+
+
+def security_callback_payload(
+    client: httpx.Client,
+    base_url: str,
+    security_desc: str,
+    chart_width: int = CHART_WIDTH,
+) -> dict:
+    """Build the request Dash sends when a security is picked, from the app's own dependency list."""
+    dependencies = client.get(f"{base_url}/_dash-dependencies").json()
+    for dependency in dependencies:
+        inputs = dependency["inputs"]
+        if inputs == [{"id": "security-dropdown", "property": "value"}] and "trades-chart" in dependency["output"]:
+            break
+    else:
+        raise ValueError("No callback on security-dropdown.value found")
+    outputs = []
+    for output in dependency["output"].strip(".").split("..."):
+        component_id, prop = output.rsplit(".", 1)
+        outputs.append({"id": component_id, "property": prop})
+    # Every State of the callback must be sent, with the value the browser would have
+    state_values = {("chart-width", "data"): chart_width}
+    state = [
+        {**dependency_state, "value": state_values.get((dependency_state["id"], dependency_state["property"]))}
+        for dependency_state in dependency["state"]
+    ]
+    return {
+        "output": dependency["output"],
+        "outputs": outputs,
+        "inputs": [{"id": "security-dropdown", "property": "value", "value": security_desc}],
+        "changedPropIds": ["security-dropdown.value"],
+        "state": state,
+    }
+
+
+def run_load(base_url: str, payload: dict, concurrency: int, duration: float) -> dict[str, float]:
+    """
+    Replay the callback from `concurrency` clients for `duration` seconds.
+
+    Returns:
+        dict[str, float]: Request and error counts, throughput and latency percentiles
+    """
+    deadline = time.perf_counter() + duration
+
+    def client_loop() -> tuple[list[float], int]:
+        latencies, errors = [], 0
+        with httpx.Client(timeout=30) as client:
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = client.post(f"{base_url}/_dash-update-component", json=payload)
+                    response.raise_for_status()
+                    latencies.append(time.perf_counter() - started)
+                except httpx.HTTPError:
+                    errors += 1
+        return latencies, errors
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda _: client_loop(), range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for client_latencies, _ in results for latency in client_latencies)
+    if not latencies:
+        raise RuntimeError("Every request failed")
+    return {
+        "requests": len(latencies),
+        "errors": sum(errors for _, errors in results),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+def start_server(app: str, workers: int, port: int) -> subprocess.Popen:
+    """Start gunicorn with the production config and wait until it answers."""
+    env = {**os.environ, "WEB_CONCURRENCY": str(workers), "PORT": str(port)}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--access-logfile", os.devnull, app],
+        cwd=ROOT,
+        env=env,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with code {process.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError("gunicorn did not start within 60s")
+
+
+def main():
+    """
+    Measure dashboard throughput for several gunicorn worker counts.
+    Usage: python -m scripts.load_test "7.18% GS 2033" --workers 1 2 4 --concurrency 16 --duration 20
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("security")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--port", type=int, default=8050)
+    parser.add_argument("--app", default="app:server", help="WSGI app served by gunicorn")
+    parser.add_argument("--chart-width", type=int, default=CHART_WIDTH)
+    args = parser.parse_args()
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    results = {}
+    for workers in args.workers:
+        process = start_server(args.app, workers, args.port)
+        try:
+            with httpx.Client(timeout=30) as client:
+                payload = security_callback_payload(client, base_url, args.security, args.chart_width)
+                # Warm the caches so every run measures the same steady state
+                client.post(f"{base_url}/_dash-update-component", json=payload).raise_for_status()
+            results[workers] = run_load(base_url, payload, args.concurrency, args.duration)
+        finally:
+            process.terminate()
+            process.wait()
+        logger.info(f"{workers} workers: {results[workers]}")
+
+    baseline = results[args.workers[0]]["rps"]
+    print(f"{'workers':>8} {'req/s':>10} {'speedup':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+    for workers, result in results.items():
+        print(
+            f"{workers:>8} {result['rps']:>10.1f} {result['rps'] / baseline:>8.2f} "
+            f"{result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {result['errors']:>7}"
+        )
+
+if __name__ == "__main__":
+    main()
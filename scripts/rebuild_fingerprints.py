@@ -0,0 +1,18 @@
+import logging
+from services.db_utils import rebuild_regular_market_fingerprints
+from utils.logging import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """
+    Rebuild the local fingerprint cache from the regular_market table.
+    Run it after restoring the database or when the cache file is lost.
+    """
+    count = rebuild_regular_market_fingerprints()
+    logger.info(f"Fingerprint cache rebuilt with {count} securities.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import argparse
+import datetime
+import logging
+import time
+from pathlib import Path
+from services.archive import archive_files, iter_archived_snapshots, read_archive_file
+from services.db_utils import rebuild_regular_market_fingerprints, write_regular_market
+from services.fingerprint import FingerprintCache
+from services.market_batch import MarketBatch
+from services.validation import validate_regular_market
+from utils.logging import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+TABLE = "ndsomEntityTable"
+BATCH_SIZE = 50_000
+
+
+def decode_and_validate(path: Path) -> list[tuple[datetime.datetime, MarketBatch, dict[str, int]]]:
+    """Decode one archive file and validate its snapshots, run in a worker process."""
+    snapshots = []
+    for scraped_at, rows in read_archive_file(path):
+        snapshot, rejects = validate_regular_market(rows, scraped_at)
+        snapshots.append((scraped_at, snapshot, rejects))
+    return snapshots
+
+
+def replay(
+    start_date: datetime.date,
+    end_date: datetime.date,
+    table_name: str = TABLE,
+    workers: int = 4,
+    batch_size: int = BATCH_SIZE,
+) -> dict[str, int]:
+    """
+    Re-ingest archived snapshots of a table through the regular_market write path.
+
+    Files are decoded and validated by parallel worker processes. Each snapshot is diffed
+    against the previous one with an in-memory fingerprint cache, so only
+    change points are written, and those are flushed in large batches.
+
+    Args:
+        start_date (datetime.date): First archived day to replay
+        end_date (datetime.date): Last archived day to replay, inclusive
+        table_name (str): The archived table
+        workers (int): Number of decode processes
+        batch_size (int): Rows per write_regular_market call
+
+    Returns:
+        dict[str, int]: Summed ingest counts plus the number of snapshots replayed
+    """
+    files = archive_files(table_name, start_date, end_date)
+    logger.info(f"Replaying {len(files)} archive files of '{table_name}' from {start_date} to {end_date}.")
+
+    # Local to the replay, the live cache is rebuilt from the database at the end
+    fingerprints = FingerprintCache()
+    totals = {"inserted": 0, "updated": 0, "unchanged": 0, "rejected": 0, "snapshots": 0}
+    batch, batch_rows = [], 0
+
+    def flush():
+        counts = write_regular_market(MarketBatch.concat(batch))
+        for key, value in counts.items():
+            totals[key] += value
+        batch.clear()
+
+    started = time.perf_counter()
+    for scraped_at, snapshot, rejects in iter_archived_snapshots(files, workers=workers, decoder=decode_and_validate):
+        changed = fingerprints.filter_changed(snapshot)
+        fingerprints.update(changed)
+        totals["unchanged"] += len(snapshot) - len(changed)
+        totals["rejected"] += rejects["total"]
+        totals["snapshots"] += 1
+        if not changed.is_empty:
+            batch.append(changed)
+            batch_rows += len(changed)
+        if batch_rows >= batch_size:
+            flush()
+            batch_rows = 0
+    if batch:
+        flush()
+
+    rebuild_regular_market_fingerprints()
+    logger.info(f"Replay finished in {time.perf_counter() - started:.1f}s: {totals}")
+    return totals
+
+
+def main():
+    """
+    Replay archived snapshots into the database, e.g. after a schema or logic change.
+    Usage: python -m scripts.replay_archive 2025-07-01 2025-07-31 --workers 8
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("start_date", type=datetime.date.fromisoformat)
+    parser.add_argument("end_date", type=datetime.date.fromisoformat)
+    parser.add_argument("--table", default=TABLE)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+    replay(args.start_date, args.end_date, args.table, args.workers, args.batch_size)
+
+if __name__ == "__main__":
+    main()
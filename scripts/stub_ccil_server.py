@@ -0,0 +1,100 @@
+import argparse
+import json
+import logging
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from utils.logging import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+SECURITIES = ["7.10% GS 2034", "7.18% GS 2033", "6.79% GS 2031", "7.32% GS 2030", "364 DTB 26062025"]
+
+
+def stub_payload() -> dict:
+    """A CCIL-shaped response: `result1` is a JSON string of rows with random prices."""
+    rows = []
+    for security in SECURITIES:
+        ltp = round(random.uniform(98, 102), 4)
+        rows.append({
+            "ismt_idnt": security, "ttc": random.randint(1, 500), "tta": round(random.uniform(5, 5000), 2),
+            "op": ltp, "hi": ltp + 0.1, "lo": ltp - 0.1, "ltp": ltp, "lty": round(random.uniform(6, 7.5), 4),
+        })
+    return {"result1": json.dumps(rows)}
+
+
+def make_stub_server(
+    port: int = 0,
+    fail_rate: float = 0.0,
+    fail_status: int = 429,
+    retry_after: float | None = None,
+) -> ThreadingHTTPServer:
+    """
+    Build a local stand-in for the CCIL AJAX endpoints, to exercise pacing, retries
+    and the circuit breaker without hitting the real site.
+
+    Args:
+        port (int): Port to listen on, 0 picks a free one
+        fail_rate (float): Share of requests answered with `fail_status`
+        fail_status (int): Status code of the failed responses, e.g. 429, 403 or 503
+        retry_after (float | None): Retry-After header sent with the failures
+
+    Returns:
+        ThreadingHTTPServer: The server, not started. Requests counts per endpoint
+        and status are kept in its `hits` dict.
+    """
+    hits: dict[str, int] = {}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            resource = parse_qs(urlparse(self.path).query).get("p_p_resource_id", ["?"])[0]
+            failed = random.random() < fail_rate
+            status = fail_status if failed else 200
+            with lock:
+                hits[f"{resource}:{status}"] = hits.get(f"{resource}:{status}", 0) + 1
+            body = b"" if failed else json.dumps(stub_payload()).encode()
+            self.send_response(status)
+            if failed and retry_after is not None:
+                self.send_header("Retry-After", str(retry_after))
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    server.hits = hits
+    return server
+
+
+def main():
+    """
+    Serve stub CCIL endpoints, then point a scrape at http://127.0.0.1:<port>/.
+    Usage: python -m scripts.stub_ccil_server --port 8765 --fail-rate 0.3 --fail-status 429
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--fail-status", type=int, default=429)
+    parser.add_argument("--retry-after", type=float, default=None)
+    args = parser.parse_args()
+    server = make_stub_server(args.port, args.fail_rate, args.fail_status, args.retry_after)
+    logger.info(f"Stub CCIL server listening on http://127.0.0.1:{server.server_address[1]}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        logger.info(f"Requests served: {server.hits}")
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import datetime
+import gzip
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterator
+from setting import config
+from utils.logging import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SUFFIX = ".jsonl.gz"
+
+
+def _archive_root(archive_dir: str | Path | None = None) -> Path:
+    return Path(archive_dir or config.get_settings().archive_dir)
+
+
+def archive_path(table_name: str, day: datetime.date, archive_dir: str | Path | None = None) -> Path:
+    return _archive_root(archive_dir) / table_name / f"{day.isoformat()}{ARCHIVE_SUFFIX}"
+
+
+def archive_snapshot(
+    table_name: str,
+    rows: list[dict],
+    scraped_at: datetime.datetime | None = None,
+    archive_dir: str | Path | None = None,
+) -> Path:
+    """
+    Append a raw scrape result to the archive of its table and day.
+
+    Each call appends one gzip member holding one JSON line, so the file stays
+    a valid gzip stream and earlier snapshots are never rewritten.
+
+    Args:
+        table_name (str): The scraped table
+        rows (list[dict]): The raw `result1` rows
+        scraped_at (datetime | None): Snapshot time, defaults to now
+        archive_dir (str | Path | None): Archive root, defaults to settings.archive_dir
+
+    Returns:
+        Path: The archive file written to
+    """
+    scraped_at = scraped_at or datetime.datetime.now()
+    path = archive_path(table_name, scraped_at.date(), archive_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    line = json.dumps({"scraped_at": scraped_at.isoformat(), "table": table_name, "rows": rows}, separators=(",", ":"))
+    with gzip.open(path, "ab", compresslevel=6) as f:
+        f.write(line.encode("utf-8") + b"\n")
+    return path
+
+
+def archive_files(
+    table_name: str,
+    start_date: datetime.date,
+    end_date: datetime.date,
+    archive_dir: str | Path | None = None,
+) -> list[Path]:
+    """List the archive files of a table between two dates, inclusive, in date order."""
+    table_dir = _archive_root(archive_dir) / table_name
+    files = []
+    for path in sorted(table_dir.glob(f"*{ARCHIVE_SUFFIX}")):
+        day = datetime.date.fromisoformat(path.name[: -len(ARCHIVE_SUFFIX)])
+        if start_date <= day <= end_date:
+            files.append(path)
+    return files
+
+
+def read_archive_file(path: Path) -> list[tuple[datetime.datetime, list[dict]]]:
+    """
+    Decompress and decode one archive file.
+
+    Returns:
+        list[tuple[datetime, list[dict]]]: (scraped_at, rows) per snapshot, in time order
+    """
+    snapshots = []
+    with gzip.open(path, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            snapshot = json.loads(line)
+            snapshots.append((datetime.datetime.fromisoformat(snapshot["scraped_at"]), snapshot["rows"]))
+    snapshots.sort(key=lambda snapshot: snapshot[0])
+    return snapshots
+
+
+def iter_archived_snapshots(
+    files: list[Path],
+    workers: int = 4,
+    decoder: Callable[[Path], list[tuple]] = read_archive_file,
+) -> Iterator[tuple]:
+    """
+    Stream the snapshots of several archive files in file order, decoding files
+    in parallel worker processes.
+
+    Args:
+        files (list[Path]): Archive files, in the order to replay them
+        workers (int): Number of decode processes, 1 decodes in-process
+        decoder (Callable): Picklable function turning a file into its snapshots,
+            `read_archive_file` or a wrapper that also validates them
+
+    Returns:
+        Iterator[tuple]: The decoded snapshots
+    """
+    if workers <= 1:
+        for path in files:
+            yield from decoder(path)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for snapshots in executor.map(decoder, files):
+            yield from snapshots
@@ -1,127 +1,548 @@
+from functools import lru_cache
+from pathlib import Path
 from typing import List
-from sqlalchemy import select
+from sqlalchemy import func, select, text
+from setting import config
 from setting.sqlalchemy_config import get_db_session
-from setting.model import RegularMarket
+from setting.model import DataVersion, RegularMarket, RegularMarketDaily, RegularMarketTick
+from services.fingerprint import FingerprintCache, get_fingerprint_cache
+from services.market_batch import MarketBatch
+from services.query_cache import VersionedQueryCache
+from services.shared_cache import SharedResultStore
+from services.security_index import SecurityIndex
+from services.validation import validate_regular_market
 import datetime
 import logging
+import numpy as np
+import pandas as pd
+from sqlalchemy import types
 from utils.logging import setup_logging
 
 setup_logging()
 logger = logging.getLogger(__name__)
 
+def regular_market_by_security_query(security_desc: str):
+    return (
+        select(RegularMarket)
+        .where(RegularMarket.security_desc == security_desc)
+        .order_by(RegularMarket.timestamp)
+    )
+
+def regular_market_by_date_query(date: datetime.date):
+    return (
+        select(RegularMarket)
+        .where(RegularMarket.timestamp >= datetime.datetime.combine(date, datetime.time.min))
+        .where(RegularMarket.timestamp < datetime.datetime.combine(date + datetime.timedelta(days=1), datetime.time.min))
+        .order_by(RegularMarket.timestamp)
+    )
+
+def regular_market_ticks_by_security_query(security_desc: str, start_date: datetime.date, end_date: datetime.date):
+    return (
+        select(RegularMarketTick)
+        .where(RegularMarketTick.security_desc == security_desc)
+        .where(RegularMarketTick.timestamp >= datetime.datetime.combine(start_date, datetime.time.min))
+        .where(RegularMarketTick.timestamp < datetime.datetime.combine(end_date + datetime.timedelta(days=1), datetime.time.min))
+        .order_by(RegularMarketTick.timestamp)
+    )
+
+def regular_market_daily_by_security_query(security_desc: str):
+    return (
+        select(RegularMarketDaily)
+        .where(RegularMarketDaily.security_desc == security_desc)
+        .order_by(RegularMarketDaily.trade_date)
+    )
+
+def regular_market_daily_range_query(
+    security_desc: str, start_date: datetime.date, end_date: datetime.date, columns: tuple[str, ...] | None = None
+):
+    selected = [getattr(RegularMarketDaily, column) for column in columns] if columns else [RegularMarketDaily]
+    return (
+        select(*selected)
+        .where(RegularMarketDaily.security_desc == security_desc)
+        .where(RegularMarketDaily.trade_date >= start_date)
+        .where(RegularMarketDaily.trade_date <= end_date)
+        .order_by(RegularMarketDaily.trade_date)
+    )
+
+def regular_market_date_bounds_query(security_desc: str):
+    return (
+        select(
+            func.min(RegularMarketDaily.trade_date).label("min_date"),
+            func.max(RegularMarketDaily.trade_date).label("max_date"),
+            func.count().label("days"),
+        )
+        .where(RegularMarketDaily.security_desc == security_desc)
+    )
+
+def latest_regular_market_by_security_query(security_desc: str):
+    return (
+        select(RegularMarket)
+        .where(RegularMarket.security_desc == security_desc)
+        .order_by(RegularMarket.timestamp.desc())
+        .limit(1)
+    )
+
 def get_regular_market_data_by_security(security_desc: str) -> List[RegularMarket]:
     with get_db_session() as session:
-        query = (
-            select(RegularMarket)
-            .where(RegularMarket.security_desc == security_desc)
-            .order_by(RegularMarket.timestamp)
-        )
-        result = session.execute(query)
+        result = session.execute(regular_market_by_security_query(security_desc))
         data = result.scalars().all()
         return data
 
+def get_regular_market_daily_by_security(security_desc: str) -> List[RegularMarketDaily]:
+    """
+    Return the pre-aggregated daily rows of a security, ordered by date.
+    """
+    with get_db_session() as session:
+        result = session.execute(regular_market_daily_by_security_query(security_desc))
+        return result.scalars().all()
+
+def get_regular_market_daily_range(
+    security_desc: str, start_date: datetime.date, end_date: datetime.date
+) -> List[RegularMarketDaily]:
+    """
+    Return the daily rows of a security between two dates, inclusive, ordered by date.
+    """
+    with get_db_session() as session:
+        result = session.execute(regular_market_daily_range_query(security_desc, start_date, end_date))
+        return result.scalars().all()
+
+def get_regular_market_security_metadata(security_desc: str) -> dict | None:
+    """
+    Return the traded date range and the latest row of a security, from two index seeks.
+
+    Returns:
+        dict | None: `min_date`, `max_date`, `days` (number of traded days) and
+        `latest` (RegularMarket), or None when the security has no data
+    """
+    with get_db_session() as session:
+        bounds = session.execute(regular_market_date_bounds_query(security_desc)).mappings().one()
+        if not bounds["days"]:
+            return None
+        latest = session.execute(latest_regular_market_by_security_query(security_desc)).scalars().first()
+        return {**bounds, "latest": latest}
+
+# Rows per fetchmany round trip of the columnar reads
+COLUMN_CHUNK_SIZE = 10_000
+
+# Columns the dashboard charts and summary read from regular_market_daily
+DAILY_CHART_COLUMNS = ("trade_date", "trades", "tta", "high", "low", "ltp")
+
+def _numpy_dtype(sa_type) -> np.dtype:
+    # REAL is a Float and BigInteger an Integer; prices are kept as float64 either way
+    if isinstance(sa_type, types.Float):
+        return np.dtype(np.float64)
+    if isinstance(sa_type, types.Integer):
+        return np.dtype(np.int64)
+    if isinstance(sa_type, types.DateTime):
+        return np.dtype("datetime64[us]")
+    if isinstance(sa_type, types.Date):
+        return np.dtype("datetime64[D]")
+    return np.dtype(object)
+
+def fetch_columns(query, chunk_size: int = COLUMN_CHUNK_SIZE) -> dict[str, np.ndarray]:
+    """
+    Run a Core select and return one typed NumPy array per selected column.
+
+    Rows are fetched in chunks of `chunk_size` and each chunk is converted
+    column-wise straight away, so no ORM object or per-row dict is built. The
+    dtype comes from the column's SQL type (FLOAT -> float64, BIGINT -> int64,
+    DATE -> datetime64[D], ...); the columns must not be nullable.
+
+    Args:
+        query: A select of columns, e.g. `select(Model.a, Model.b)`
+        chunk_size (int): Rows per fetch
+
+    Returns:
+        dict[str, np.ndarray]: Arrays keyed by column label, in select order
+    """
+    dtypes = {column.name: _numpy_dtype(column.type) for column in query.selected_columns}
+    chunks = {name: [] for name in dtypes}
+    with get_db_session() as session:
+        result = session.execute(query.execution_options(stream_results=True, yield_per=chunk_size))
+        for partition in result.partitions():
+            for name, values in zip(dtypes, zip(*partition)):
+                chunks[name].append(np.array(values, dtype=dtypes[name]))
+    return {
+        name: np.concatenate(parts) if parts else np.empty(0, dtype=dtypes[name])
+        for name, parts in chunks.items()
+    }
+
+def fetch_frame(query, chunk_size: int = COLUMN_CHUNK_SIZE) -> pd.DataFrame:
+    """`fetch_columns` as a DataFrame, the arrays are used without another copy."""
+    return pd.DataFrame(fetch_columns(query, chunk_size), copy=False)
+
+def get_regular_market_daily_range_frame(
+    security_desc: str,
+    start_date: datetime.date,
+    end_date: datetime.date,
+    columns: tuple[str, ...] = DAILY_CHART_COLUMNS,
+) -> pd.DataFrame:
+    """
+    Return selected daily columns of a security between two dates, inclusive, as a typed DataFrame.
+    """
+    return fetch_frame(regular_market_daily_range_query(security_desc, start_date, end_date, columns))
+
 def get_regular_market_all_security_descriptions() -> List[str]:
     with get_db_session() as session:
         query = select(RegularMarket.security_desc).distinct()
         result = session.execute(query)
         return result.scalars().all()
     
+def get_regular_market_ticks_by_security(
+    security_desc: str, start_date: datetime.date, end_date: datetime.date
+) -> List[RegularMarketTick]:
+    """
+    Return the intraday series of a security between two dates, inclusive.
+    """
+    with get_db_session() as session:
+        result = session.execute(regular_market_ticks_by_security_query(security_desc, start_date, end_date))
+        return result.scalars().all()
+
 def get_regular_market_data_by_date(date: datetime.date) -> List[RegularMarket]:
     with get_db_session() as session:
-        query = (
-            select(RegularMarket)
-            .where(RegularMarket.timestamp >= datetime.datetime.combine(date, datetime.time.min))
-            .where(RegularMarket.timestamp < datetime.datetime.combine(date + datetime.timedelta(days=1), datetime.time.min))
-            .order_by(RegularMarket.timestamp)
-        )
-        result = session.execute(query)
+        result = session.execute(regular_market_by_date_query(date))
         data = result.scalars().all()
         return data
      
-def insert_regular_market(data: list[dict]):
-    timestamp = datetime.datetime.now()
-    
+# data_version row bumped by every ingest that changes regular_market
+REGULAR_MARKET_VERSION = "regular_market"
+SHARED_QUERY_CACHE_FILE = "query_cache.sqlite"
+
+def get_data_version(name: str = REGULAR_MARKET_VERSION) -> int:
     with get_db_session() as session:
-        records_to_insert = []
-        updated_count = 0
-        for item in data:
-            try:
-                security_desc = item.get("ismt_idnt")
-                trades = int(item.get("ttc"))
-                tta = float(item.get("tta"))
-                open_price = float(item.get("op"))
-                high = float(item.get("hi"))
-                low = float(item.get("lo"))
-                ltp = float(item.get("ltp"))
-                lty = float(item.get("lty"))
-            except (ValueError, TypeError) as e:
-                logger.warning(f"Error parsing data for security '{security_desc}': {e}")
-                continue
-            if (
-                security_desc is None or 
-                trades is None or  
-                tta is None or  
-                open_price is None or  
-                high is None or  
-                low is None or  
-                ltp is None or 
-                lty is None
-            ):
-                logger.warning(f"Missing data for security '{security_desc}'. Skipping record. {item}")
-                continue
-
-            # Get the latest record for this security
-            latest = (
-                session.query(RegularMarket)
-                .filter_by(security_desc=security_desc)
-                .order_by(RegularMarket.timestamp.desc())
-                .first()
-            )
-
-            if latest and latest.timestamp.date() == timestamp.date():
-                if (
-                    latest.trades != trades or
-                    latest.tta != tta or
-                    latest.open != open_price or
-                    latest.high != high or
-                    latest.low != low or
-                    latest.ltp != ltp or
-                    latest.lty != lty
-                ):
-                # If a record from the same day exist and data is different, update the existing record
-                    latest.trades = trades
-                    latest.tta = tta
-                    latest.open = open_price
-                    latest.high = high
-                    latest.low = low
-                    latest.ltp = ltp
-                    latest.lty = lty
-                    latest.timestamp = timestamp
-                    updated_count += 1
-            else:
-                # Otherwise, create a new record to be inserted
-                record = RegularMarket(
-                    security_desc=security_desc,
-                    trades=trades,
-                    tta=tta,
-                    open=open_price,
-                    high=high,
-                    low=low,
-                    ltp=ltp,
-                    lty=lty,
-                    timestamp=timestamp
-                )
-                records_to_insert.append(record)
-        
-        if records_to_insert:
-            session.add_all(records_to_insert)
-        
+        version = session.execute(select(DataVersion.version).where(DataVersion.name == name)).scalar_one_or_none()
+        return version or 0
+
+@lru_cache()
+def get_query_cache() -> VersionedQueryCache:
+    settings = config.get_settings()
+    shared = None
+    if settings.shared_query_cache:
+        shared = SharedResultStore(Path(settings.cache_dir) / SHARED_QUERY_CACHE_FILE, settings.shared_query_cache_size)
+    return VersionedQueryCache(
+        version_loader=get_data_version,
+        maxsize=settings.query_cache_size,
+        ttl=settings.query_cache_ttl,
+        version_ttl=settings.query_cache_version_ttl,
+        shared=shared,
+    )
+
+def get_regular_market_daily_range_frame_cached(
+    security_desc: str,
+    start_date: datetime.date,
+    end_date: datetime.date,
+    columns: tuple[str, ...] = DAILY_CHART_COLUMNS,
+) -> pd.DataFrame:
+    """
+    `get_regular_market_daily_range_frame` served from the query cache until the next ingest.
+    The frame is shared between callers and must not be modified.
+    """
+    return get_query_cache().get_or_load(
+        ("regular_market_daily_frame", security_desc, start_date, end_date, columns),
+        lambda: get_regular_market_daily_range_frame(security_desc, start_date, end_date, columns),
+    )
+
+def get_regular_market_security_metadata_cached(security_desc: str) -> dict | None:
+    """`get_regular_market_security_metadata` served from the query cache until the next ingest."""
+    return get_query_cache().get_or_load(
+        ("regular_market_metadata", security_desc), lambda: get_regular_market_security_metadata(security_desc)
+    )
+
+def get_security_index() -> SecurityIndex:
+    """Search index over all securities, rebuilt from the database only after an ingest."""
+    return get_query_cache().get_or_load(
+        ("security_index",), lambda: SecurityIndex(get_regular_market_all_security_descriptions())
+    )
+
+def search_security_descriptions(query: str | None, limit: int = 20) -> List[str]:
+    """Return the top `limit` securities matching the typed query, for typeahead lookups."""
+    return get_security_index().search(query or "", limit)
+
+def get_query_cache_stats() -> dict:
+    """Hit and miss counts, size and data version of the query cache."""
+    return get_query_cache().stats()
+
+REGULAR_MARKET_STAGING_TABLE = "#regular_market_staging"
+
+# Prices are FLOAT like the regular_market columns created by e19ebbc6acf5,
+# REAL would round every written value to float32 and make the MERGE see changes
+_CREATE_STAGING_SQL = text(f"""
+DROP TABLE IF EXISTS {REGULAR_MARKET_STAGING_TABLE};
+CREATE TABLE {REGULAR_MARKET_STAGING_TABLE} (
+    security_desc VARCHAR(255) NOT NULL,
+    trades INT NOT NULL,
+    tta FLOAT NOT NULL,
+    [open] FLOAT NOT NULL,
+    high FLOAT NOT NULL,
+    low FLOAT NOT NULL,
+    ltp FLOAT NOT NULL,
+    lty FLOAT NOT NULL,
+    [timestamp] DATETIME NOT NULL,
+    PRIMARY KEY (security_desc, [timestamp])
+);
+""")
+
+# Positional driver-level statement, fed column-wise tuples by fast_executemany
+_INSERT_STAGING_SQL = f"""
+INSERT INTO {REGULAR_MARKET_STAGING_TABLE}
+    (security_desc, trades, tta, [open], high, low, ltp, lty, [timestamp])
+VALUES
+    (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Same rule as the old per-item loop: a security's row for the snapshot day is
+# updated in place when any value changed, otherwise a new row is inserted.
+# A batch may hold several snapshots (archive replays), in which case the last
+# snapshot of each (security, day) is the one merged.
+_MERGE_REGULAR_MARKET_SQL = text(f"""
+WITH day_rows AS (
+    SELECT security_desc, trades, tta, [open], high, low, ltp, lty, [timestamp]
+    FROM regular_market
+    WHERE [timestamp] >= :day_start AND [timestamp] < :day_end
+),
+last_snapshot AS (
+    SELECT security_desc, trades, tta, [open], high, low, ltp, lty, [timestamp],
+           CAST(CAST([timestamp] AS DATE) AS DATETIME) AS day_start
+    FROM (
+        SELECT *, ROW_NUMBER() OVER (
+            PARTITION BY security_desc, CAST([timestamp] AS DATE)
+            ORDER BY [timestamp] DESC
+        ) AS row_number
+        FROM {REGULAR_MARKET_STAGING_TABLE}
+    ) AS ranked
+    WHERE row_number = 1
+)
+MERGE day_rows AS target
+USING last_snapshot AS source
+    ON target.security_desc = source.security_desc
+    AND target.[timestamp] >= source.day_start
+    AND target.[timestamp] < DATEADD(day, 1, source.day_start)
+WHEN MATCHED AND (
+    target.trades <> source.trades
+    OR target.tta <> source.tta
+    OR target.[open] <> source.[open]
+    OR target.high <> source.high
+    OR target.low <> source.low
+    OR target.ltp <> source.ltp
+    OR target.lty <> source.lty
+) THEN
+    UPDATE SET
+        trades = source.trades,
+        tta = source.tta,
+        [open] = source.[open],
+        high = source.high,
+        low = source.low,
+        ltp = source.ltp,
+        lty = source.lty,
+        [timestamp] = source.[timestamp]
+WHEN NOT MATCHED BY TARGET THEN
+    INSERT (security_desc, trades, tta, [open], high, low, ltp, lty, [timestamp])
+    VALUES (source.security_desc, source.trades, source.tta, source.[open], source.high,
+            source.low, source.ltp, source.lty, source.[timestamp])
+OUTPUT $action;
+""")
+
+# Every row that reaches the write path is also appended to the tick history.
+# The NOT EXISTS guard keeps re-runs of the same snapshot idempotent.
+_INSERT_TICKS_SQL = text(f"""
+INSERT INTO regular_market_ticks
+    (security_desc, trades, tta, [open], high, low, ltp, lty, [timestamp])
+SELECT s.security_desc, s.trades, s.tta, s.[open], s.high, s.low, s.ltp, s.lty, s.[timestamp]
+FROM {REGULAR_MARKET_STAGING_TABLE} AS s
+WHERE NOT EXISTS (
+    SELECT 1 FROM regular_market_ticks AS t
+    WHERE t.security_desc = s.security_desc AND t.[timestamp] = s.[timestamp]
+);
+""")
+
+# Re-aggregate only the (security, day) keys present in the staging table.
+_REFRESH_DAILY_SQL = text(f"""
+WITH touched AS (
+    SELECT DISTINCT security_desc, CAST([timestamp] AS DATE) AS trade_date
+    FROM {REGULAR_MARKET_STAGING_TABLE}
+),
+day_agg AS (
+    SELECT rm.security_desc,
+           touched.trade_date,
+           SUM(CAST(rm.trades AS BIGINT)) AS trades,
+           SUM(CAST(rm.tta AS FLOAT)) AS tta,
+           MAX(rm.high) AS high,
+           MIN(rm.low) AS low,
+           MAX(rm.[timestamp]) AS last_timestamp
+    FROM touched
+    JOIN regular_market AS rm
+        ON rm.security_desc = touched.security_desc
+        AND rm.[timestamp] >= CAST(touched.trade_date AS DATETIME)
+        AND rm.[timestamp] < DATEADD(day, 1, CAST(touched.trade_date AS DATETIME))
+    GROUP BY rm.security_desc, touched.trade_date
+)
+MERGE regular_market_daily AS target
+USING (
+    SELECT day_agg.security_desc, day_agg.trade_date, day_agg.trades, day_agg.tta,
+           day_agg.high, day_agg.low, last_row.ltp, day_agg.last_timestamp
+    FROM day_agg
+    CROSS APPLY (
+        SELECT TOP 1 rm.ltp
+        FROM regular_market AS rm
+        WHERE rm.security_desc = day_agg.security_desc AND rm.[timestamp] = day_agg.last_timestamp
+        ORDER BY rm.id DESC
+    ) AS last_row
+) AS source
+    ON target.security_desc = source.security_desc AND target.trade_date = source.trade_date
+WHEN MATCHED THEN
+    UPDATE SET
+        trades = source.trades,
+        tta = source.tta,
+        high = source.high,
+        low = source.low,
+        ltp = source.ltp,
+        last_timestamp = source.last_timestamp
+WHEN NOT MATCHED BY TARGET THEN
+    INSERT (security_desc, trade_date, trades, tta, high, low, ltp, last_timestamp)
+    VALUES (source.security_desc, source.trade_date, source.trades, source.tta,
+            source.high, source.low, source.ltp, source.last_timestamp);
+""")
+
+_DROP_STAGING_SQL = text(f"DROP TABLE IF EXISTS {REGULAR_MARKET_STAGING_TABLE};")
+
+_BUMP_DATA_VERSION_SQL = text("""
+UPDATE data_version
+SET version = version + 1, updated_at = SYSUTCDATETIME()
+WHERE name = :name;
+""")
+
+
+def write_regular_market(batch: MarketBatch) -> dict[str, int]:
+    """
+    Write validated rows with one staging load and a handful of set-based statements.
+
+    The rows are merged into regular_market (last snapshot per security and
+    day), appended to regular_market_ticks and rolled up into
+    regular_market_daily, all in one transaction. When anything changed, the
+    regular_market data version is bumped, invalidating cached reads.
+
+    Args:
+        batch (MarketBatch): Validated rows, unique per (security_desc, timestamp)
+
+    Returns:
+        dict[str, int]: Counts of `inserted`, `updated` and `unchanged` regular_market rows
+    """
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+    if batch.is_empty:
+        return counts
+
+    days = batch.days()
+    merged_keys = len(set(zip(batch.security_desc.tolist(), days.tolist())))
+    day_start = days.min().astype("datetime64[us]").item()
+    day_end = (days.max() + np.timedelta64(1, "D")).astype("datetime64[us]").item()
+
+    with get_db_session() as session:
+        session.execute(_CREATE_STAGING_SQL)
+        session.connection().exec_driver_sql(_INSERT_STAGING_SQL, list(batch.rows()))
+        actions = session.execute(
+            _MERGE_REGULAR_MARKET_SQL, {"day_start": day_start, "day_end": day_end}
+        ).scalars().all()
+        session.execute(_INSERT_TICKS_SQL)
+        session.execute(_REFRESH_DAILY_SQL)
+        session.execute(_DROP_STAGING_SQL)
+
+        counts["inserted"] = sum(1 for action in actions if action == "INSERT")
+        counts["updated"] = sum(1 for action in actions if action == "UPDATE")
+        counts["unchanged"] = merged_keys - counts["inserted"] - counts["updated"]
+        if counts["inserted"] or counts["updated"]:
+            # Same transaction as the data, so readers never see the new version without it
+            session.execute(_BUMP_DATA_VERSION_SQL, {"name": REGULAR_MARKET_VERSION})
+
         try:
-            if records_to_insert or updated_count > 0:
-                session.commit()
-                logger.info(f"Committed {len(records_to_insert)} new and {updated_count} updated records.")
+            session.commit()
+            if counts["inserted"] or counts["updated"]:
+                logger.info(f"Committed {counts['inserted']} new and {counts['updated']} updated records.")
             else:
                 logger.info("No new or updated records to commit.")
         except Exception as e:
             logger.error(f"Error committing records: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    if counts["inserted"] or counts["updated"]:
+        get_query_cache().expire_version()
+    return counts
+
+
+def insert_regular_market(
+    data: list[dict], use_fingerprints: bool = True, timestamp: datetime.datetime | None = None
+) -> dict[str, int]:
+    """
+    Upsert a scrape into regular_market with a single set-based MERGE.
+
+    The payload is validated in one vectorized pass, then rows whose
+    fingerprint matches the local last-seen cache are dropped before any SQL
+    is issued. The remaining rows go through `write_regular_market`, so the
+    number of round trips no longer depends on the number of securities.
+
+    Args:
+        data (list[dict]): Rows as returned by the CCIL `result1` payload
+        use_fingerprints (bool): Skip rows unchanged since the last ingest
+        timestamp (datetime | None): Snapshot time, defaults to now
+
+    Returns:
+        dict[str, int]: Counts of `inserted`, `updated`, `unchanged` and `rejected` rows
+    """
+    batch, rejects = validate_regular_market(data, timestamp or datetime.datetime.now())
+    rejected = rejects["total"]
+
+    fingerprints = get_fingerprint_cache() if use_fingerprints else None
+    changed = fingerprints.filter_changed(batch) if fingerprints else batch
+
+    if changed.is_empty:
+        logger.info(f"No new or updated records to commit ({len(batch)} unchanged).")
+        return {"inserted": 0, "updated": 0, "unchanged": len(batch), "rejected": rejected}
+
+    counts = write_regular_market(changed)
+    counts["unchanged"] += len(batch) - len(changed)
+    counts["rejected"] = rejected
+
+    if fingerprints is not None:
+        fingerprints.update(changed)
+        fingerprints.save()
+
+    return counts
+
+
+def latest_regular_market_query():
+    ranked = select(
+        RegularMarket,
+        func.row_number().over(
+            partition_by=RegularMarket.security_desc,
+            order_by=RegularMarket.timestamp.desc(),
+        ).label("row_number"),
+    ).subquery()
+    return select(
+        ranked.c.security_desc,
+        ranked.c.trades,
+        ranked.c.tta,
+        ranked.c.open,
+        ranked.c.high,
+        ranked.c.low,
+        ranked.c.ltp,
+        ranked.c.lty,
+        ranked.c.timestamp,
+    ).where(ranked.c.row_number == 1)
+
+
+def rebuild_regular_market_fingerprints(fingerprints: FingerprintCache | None = None) -> int:
+    """
+    Rebuild the fingerprint cache from the latest regular_market row of each security.
+
+    Args:
+        fingerprints (FingerprintCache | None): Cache to rebuild, defaults to the shared one
+
+    Returns:
+        int: Number of fingerprints written
+    """
+    fingerprints = fingerprints or get_fingerprint_cache()
+    with get_db_session() as session:
+        rows = session.execute(latest_regular_market_query()).mappings().all()
+    fingerprints.replace(MarketBatch.from_records(rows))
+    fingerprints.save()
+    logger.info(f"Rebuilt {len(fingerprints)} fingerprints from regular_market.")
+    return len(fingerprints)
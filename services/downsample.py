@@ -0,0 +1,120 @@
+import numpy as np
+
+
+def _as_float(values: np.ndarray) -> np.ndarray:
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype("datetime64[s]").astype(np.int64).astype(np.float64)
+    return values.astype(np.float64, copy=False)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Indices of the points kept by Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept and the others are split in
+    `threshold - 2` buckets. In each bucket, the point forming the largest triangle
+    with the point kept in the previous bucket and the average of the next bucket
+    is kept, which preserves peaks and the shape of the line. Bucket averages and
+    the triangle areas of a bucket are computed with NumPy, only the walk over the
+    buckets is a Python loop.
+
+    Args:
+        x (np.ndarray): Increasing x values, numbers or datetime64
+        y (np.ndarray): y values
+        threshold (int): Number of points to keep
+
+    Returns:
+        np.ndarray: Increasing indices into x and y, all of them if there are at most `threshold` points
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = _as_float(x)
+    y = _as_float(y)
+
+    # Bucket i holds the points edges[i] to edges[i + 1] - 1
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    counts = np.diff(edges)
+    average_x = np.add.reduceat(x[:n - 1], edges[:-1]) / counts
+    average_y = np.add.reduceat(y[:n - 1], edges[:-1]) / counts
+    # Third vertex of the triangles of each bucket: the next bucket's average, the last point for the last bucket
+    next_x = np.append(average_x[1:], x[-1])
+    next_y = np.append(average_y[1:], y[-1])
+
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        # Twice the triangle areas, the factor does not change the argmax
+        areas = np.abs(
+            (x[previous] - next_x[bucket]) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y[bucket] - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        kept[bucket + 1] = previous
+    return kept
+
+
+def minmax_indices(y: np.ndarray, buckets: int) -> np.ndarray:
+    """
+    Indices of the smallest and largest y of each of `buckets` equal-count buckets,
+    plus the first and last points. Fully vectorized, cheaper than LTTB on very
+    long series, at the cost of up to two points per bucket.
+
+    Args:
+        y (np.ndarray): y values, in x order
+        buckets (int): Number of buckets
+
+    Returns:
+        np.ndarray: Increasing indices into y, all of them if there are at most 2 * `buckets` points
+    """
+    n = len(y)
+    if 2 * buckets >= n or buckets < 1:
+        return np.arange(n)
+    y = _as_float(y)
+    starts = np.linspace(0, n, buckets + 1).astype(np.int64)[:-1]
+    counts = np.diff(starts, append=n)
+    bucket = np.repeat(np.arange(buckets), counts)
+    kept = [np.array([0, n - 1])]
+    for reduce in (np.minimum, np.maximum):
+        # First point of each bucket equal to its extreme value
+        candidates = np.flatnonzero(y == np.repeat(reduce.reduceat(y, starts), counts))
+        _, first = np.unique(bucket[candidates], return_index=True)
+        kept.append(candidates[first])
+    return np.unique(np.concatenate(kept))
+
+
+# Both keep at most max_points points, the first and last included
+DOWNSAMPLERS = {
+    "lttb": lambda x, y, max_points: lttb_indices(x, y, max_points),
+    "minmax": lambda x, y, max_points: minmax_indices(y, (max_points - 2) // 2),
+}
+
+
+def downsample_indices(x: np.ndarray, y: np.ndarray, max_points: int, method: str = "lttb") -> np.ndarray:
+    """
+    Indices of the points kept when reducing a series to at most `max_points` points.
+
+    Args:
+        x (np.ndarray): Increasing x values, numbers or datetime64
+        y (np.ndarray): y values
+        max_points (int): Upper bound on the kept points, e.g. the chart width in pixels
+        method (str): 'lttb' or 'minmax'
+
+    Returns:
+        np.ndarray: Increasing indices into x and y, all of them if the series is short enough
+    """
+    if method not in DOWNSAMPLERS:
+        raise ValueError(f"Unknown downsampling method '{method}', expected one of {list(DOWNSAMPLERS)}")
+    if len(y) <= max_points:
+        return np.arange(len(y))
+    return DOWNSAMPLERS[method](np.asarray(x), np.asarray(y), max_points)
+
+
+def downsample(x: np.ndarray, y: np.ndarray, max_points: int, method: str = "lttb") -> tuple[np.ndarray, np.ndarray]:
+    """`downsample_indices` applied to the series: the kept x and y values."""
+    x, y = np.asarray(x), np.asarray(y)
+    indices = downsample_indices(x, y, max_points, method)
+    return x[indices], y[indices]
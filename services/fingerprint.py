@@ -0,0 +1,109 @@
+import hashlib
+import logging
+from functools import lru_cache
+from pathlib import Path
+import numpy as np
+from services.market_batch import MarketBatch
+from setting import config
+from utils.logging import setup_logging
+from utils.state import load_json_state, save_json_state
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_FILE = "regular_market_fingerprints.json"
+
+# trades as a 64-bit int, prices as 64-bit floats like the FLOAT columns,
+# so a fingerprint rebuilt from the database equals the one of the scraped row
+_FINGERPRINT_DTYPE = np.dtype([
+    ("trades", "<i8"),
+    ("tta", "<f8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("ltp", "<f8"),
+    ("lty", "<f8"),
+])
+
+
+def fingerprint_batch(batch: MarketBatch) -> list[str]:
+    """
+    Compute a compact fingerprint of the numeric fields of each row.
+
+    The columns are packed into one contiguous structured array, then each
+    fixed-size row is hashed.
+
+    Args:
+        batch (MarketBatch): Typed regular market rows
+
+    Returns:
+        list[str]: Hex digest of the packed (trades, tta, open, high, low, ltp, lty) tuple per row
+    """
+    packed = np.empty(len(batch), dtype=_FINGERPRINT_DTYPE)
+    for name in _FINGERPRINT_DTYPE.names:
+        packed[name] = getattr(batch, name)
+    buffer = memoryview(packed.tobytes())
+    size = _FINGERPRINT_DTYPE.itemsize
+    return [
+        hashlib.blake2b(buffer[offset:offset + size], digest_size=8).hexdigest()
+        for offset in range(0, len(buffer), size)
+    ]
+
+
+def _batch_keys(batch: MarketBatch) -> list[tuple[str, str, str]]:
+    days = batch.days().astype(str).tolist()
+    return list(zip(batch.security_desc.tolist(), days, fingerprint_batch(batch)))
+
+
+class FingerprintCache:
+    """
+    Last-seen fingerprint per security, persisted as a small JSON file.
+
+    Entries are `security_desc -> [day, fingerprint]`. The day is part of the
+    entry because an unchanged value on a new day still creates a new row.
+    """
+
+    def __init__(self, path: Path | None = None, entries: dict | None = None):
+        self.path = path
+        self._entries: dict[str, list[str]] = entries or {}
+
+    @classmethod
+    def load(cls, path: Path) -> "FingerprintCache":
+        entries = load_json_state(path, default={})
+        logger.info(f"Loaded {len(entries)} fingerprints from {path}")
+        return cls(path=path, entries=entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def changed_mask(self, batch: MarketBatch) -> np.ndarray:
+        """Boolean mask of the rows whose fingerprint differs from the cached one."""
+        entries = self._entries
+        return np.fromiter(
+            (entries.get(security_desc) != [day, digest] for security_desc, day, digest in _batch_keys(batch)),
+            dtype=bool,
+            count=len(batch),
+        )
+
+    def filter_changed(self, batch: MarketBatch) -> MarketBatch:
+        """Return only the rows whose fingerprint differs from the cached one."""
+        return batch.take(self.changed_mask(batch))
+
+    def update(self, batch: MarketBatch) -> None:
+        for security_desc, day, digest in _batch_keys(batch):
+            self._entries[security_desc] = [day, digest]
+
+    def replace(self, batch: MarketBatch) -> None:
+        self._entries = {}
+        self.update(batch)
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        save_json_state(self.path, self._entries)
+
+
+@lru_cache()
+def get_fingerprint_cache() -> FingerprintCache:
+    settings = config.get_settings()
+    return FingerprintCache.load(Path(settings.cache_dir) / FINGERPRINT_FILE)
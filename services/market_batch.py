@@ -0,0 +1,88 @@
+import datetime
+from dataclasses import dataclass
+from typing import Iterator, NamedTuple
+import numpy as np
+
+PRICE_COLUMNS = ["tta", "open", "high", "low", "ltp", "lty"]
+MARKET_COLUMNS = ["security_desc", "trades", *PRICE_COLUMNS, "timestamp"]
+
+
+class MarketRow(NamedTuple):
+    """Immutable regular market row, in MARKET_COLUMNS order."""
+    security_desc: str
+    trades: int
+    tta: float
+    open: float
+    high: float
+    low: float
+    ltp: float
+    lty: float
+    timestamp: datetime.datetime
+
+
+@dataclass(frozen=True, slots=True)
+class MarketBatch:
+    """
+    Array-backed batch of regular market rows, one NumPy array per column.
+
+    Prices are float64, the precision of the FLOAT columns of regular_market,
+    and timestamps are datetime64[us]. Rows only become ORM objects on reads.
+    """
+    security_desc: np.ndarray
+    trades: np.ndarray
+    tta: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    ltp: np.ndarray
+    lty: np.ndarray
+    timestamp: np.ndarray
+
+    @classmethod
+    def from_columns(cls, **columns) -> "MarketBatch":
+        """Build a batch from array-likes, casting each column to its storage dtype."""
+        return cls(
+            security_desc=np.asarray(columns["security_desc"], dtype=object),
+            trades=np.asarray(columns["trades"], dtype=np.int64),
+            **{column: np.asarray(columns[column], dtype=np.float64) for column in PRICE_COLUMNS},
+            timestamp=np.asarray(columns["timestamp"], dtype="datetime64[us]"),
+        )
+
+    @classmethod
+    def from_records(cls, records) -> "MarketBatch":
+        """Build a batch from mappings or rows exposing MARKET_COLUMNS, e.g. query results."""
+        records = list(records)
+        return cls.from_columns(**{
+            column: [record[column] for record in records] for column in MARKET_COLUMNS
+        })
+
+    @classmethod
+    def empty(cls) -> "MarketBatch":
+        return cls.from_columns(**{column: [] for column in MARKET_COLUMNS})
+
+    @classmethod
+    def concat(cls, batches: list["MarketBatch"]) -> "MarketBatch":
+        if not batches:
+            return cls.empty()
+        return cls(**{
+            column: np.concatenate([getattr(batch, column) for batch in batches]) for column in MARKET_COLUMNS
+        })
+
+    def __len__(self) -> int:
+        return len(self.security_desc)
+
+    @property
+    def is_empty(self) -> bool:
+        return len(self) == 0
+
+    def take(self, selector: np.ndarray) -> "MarketBatch":
+        """Select rows with a boolean mask or an index array."""
+        return MarketBatch(**{column: getattr(self, column)[selector] for column in MARKET_COLUMNS})
+
+    def days(self) -> np.ndarray:
+        return self.timestamp.astype("datetime64[D]")
+
+    def rows(self) -> Iterator[MarketRow]:
+        """Yield rows as Python scalars, ready to be bound by the DB driver."""
+        # tolist() turns NumPy scalars into the Python types pyodbc binds
+        return map(MarketRow._make, zip(*(getattr(self, column).tolist() for column in MARKET_COLUMNS)))
@@ -0,0 +1,166 @@
+import datetime
+import logging
+import os
+import shutil
+from pathlib import Path
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+from sqlalchemy import select
+from setting import config
+from setting.model import RegularMarket, RegularMarketTick
+from setting.sqlalchemy_config import get_db_session
+from utils.logging import setup_logging
+from utils.state import load_json_state, save_json_state
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+WATERMARK_FILE = "_watermark.json"
+STREAM_CHUNK_SIZE = 50_000
+
+MARKET_SCHEMA = pa.schema([
+    ("security_desc", pa.string()),
+    ("trades", pa.int64()),
+    ("tta", pa.float64()),
+    ("open", pa.float64()),
+    ("high", pa.float64()),
+    ("low", pa.float64()),
+    ("ltp", pa.float64()),
+    ("lty", pa.float64()),
+    ("timestamp", pa.timestamp("us")),
+])
+
+EXPORT_TABLES = {
+    "regular_market": RegularMarket,
+    "regular_market_ticks": RegularMarketTick,
+}
+
+
+def _parquet_root(parquet_dir: str | Path | None = None) -> Path:
+    return Path(parquet_dir or config.get_settings().parquet_dir)
+
+
+def _write_partition(table_dir: Path, day: datetime.date, rows: list[tuple]) -> None:
+    """Replace the partition of one day; readers see either the old or the new file."""
+    columns = list(zip(*rows))
+    batch = pa.table(
+        {field.name: pa.array(values, type=field.type) for field, values in zip(MARKET_SCHEMA, columns)},
+        schema=MARKET_SCHEMA,
+    )
+    partition_dir = table_dir / f"date={day.isoformat()}"
+    tmp_dir = table_dir / f".date={day.isoformat()}.{os.getpid()}.tmp"
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    pq.write_table(batch, tmp_dir / "part-0.parquet", compression="zstd")
+    if partition_dir.exists():
+        shutil.rmtree(partition_dir)
+    os.replace(tmp_dir, partition_dir)
+
+
+def export_table(table_name: str, full: bool = False, parquet_dir: str | Path | None = None) -> int:
+    """
+    Export a market table to Parquet, partitioned as `<table>/date=YYYY-MM-DD/`.
+
+    Only the partitions from the day of the last exported timestamp onwards are
+    rewritten, as regular_market rows of the current day are updated in place.
+
+    Args:
+        table_name (str): One of EXPORT_TABLES
+        full (bool): Ignore the watermark and rewrite every partition, e.g. after an archive replay
+        parquet_dir (str | Path | None): Export root, defaults to settings.parquet_dir
+
+    Returns:
+        int: Number of partitions written
+    """
+    model = EXPORT_TABLES[table_name]
+    root = _parquet_root(parquet_dir)
+    table_dir = root / table_name
+    watermarks = load_json_state(root / WATERMARK_FILE, default={})
+
+    since = None
+    if not full and watermarks.get(table_name):
+        watermark = datetime.datetime.fromisoformat(watermarks[table_name])
+        since = datetime.datetime.combine(watermark.date(), datetime.time.min)
+
+    query = select(*(getattr(model, field.name) for field in MARKET_SCHEMA)).order_by(model.timestamp)
+    if since is not None:
+        query = query.where(model.timestamp >= since)
+
+    partitions = 0
+    current_day, rows, last_timestamp = None, [], None
+    with get_db_session() as session:
+        result = session.execute(query.execution_options(stream_results=True, yield_per=STREAM_CHUNK_SIZE))
+        for chunk in result.partitions():
+            for row in chunk:
+                day = row.timestamp.date()
+                if day != current_day and rows:
+                    _write_partition(table_dir, current_day, rows)
+                    partitions += 1
+                    rows = []
+                current_day = day
+                rows.append(tuple(row))
+                last_timestamp = row.timestamp
+    if rows:
+        _write_partition(table_dir, current_day, rows)
+        partitions += 1
+
+    if last_timestamp is not None:
+        watermarks[table_name] = last_timestamp.isoformat()
+        save_json_state(root / WATERMARK_FILE, watermarks)
+    logger.info(f"Exported {partitions} partitions of '{table_name}' to {table_dir}.")
+    return partitions
+
+
+def export_all(full: bool = False, parquet_dir: str | Path | None = None) -> dict[str, int]:
+    return {table_name: export_table(table_name, full, parquet_dir) for table_name in EXPORT_TABLES}
+
+
+def load_security_history(
+    security_descs: list[str],
+    table_name: str = "regular_market",
+    columns: list[str] | None = None,
+    start_date: datetime.date | None = None,
+    end_date: datetime.date | None = None,
+    parquet_dir: str | Path | None = None,
+) -> dict[str, np.ndarray]:
+    """
+    Load the exported history of a set of securities as columnar arrays.
+
+    Files are memory-mapped and filtered on the partition date and security,
+    so no request reaches the production database.
+
+    Args:
+        security_descs (list[str]): Securities to load
+        table_name (str): One of EXPORT_TABLES
+        columns (list[str] | None): Columns to return, defaults to all of MARKET_SCHEMA
+        start_date (date | None): First partition date to read
+        end_date (date | None): Last partition date to read, inclusive
+        parquet_dir (str | Path | None): Export root, defaults to settings.parquet_dir
+
+    Returns:
+        dict[str, np.ndarray]: One array per column, sorted by security then timestamp
+    """
+    columns = columns or MARKET_SCHEMA.names
+    table_dir = _parquet_root(parquet_dir) / table_name
+    if not table_dir.exists():
+        return {column: np.array([]) for column in columns}
+
+    dataset = ds.dataset(
+        str(table_dir),
+        schema=MARKET_SCHEMA.append(pa.field("date", pa.date32())),
+        format="parquet",
+        filesystem=pafs.LocalFileSystem(use_mmap=True),
+        partitioning=ds.partitioning(pa.schema([("date", pa.date32())]), flavor="hive"),
+    )
+    expression = ds.field("security_desc").isin(security_descs)
+    if start_date is not None:
+        expression &= ds.field("date") >= start_date
+    if end_date is not None:
+        expression &= ds.field("date") <= end_date
+
+    table = dataset.to_table(columns=list({*columns, "security_desc", "timestamp"}), filter=expression)
+    table = table.sort_by([("security_desc", "ascending"), ("timestamp", "ascending")])
+    return {column: table.column(column).to_numpy() for column in columns}
+
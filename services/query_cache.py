@@ -0,0 +1,105 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable
+from services.shared_cache import MISSING, SharedResultStore
+from utils.logging import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+
+class VersionedQueryCache:
+    """
+    Bounded LRU cache of query results, valid for one data version.
+
+    Every entry records the data version it was loaded at. An entry is served
+    only while that version is still current and its TTL has not expired, so a
+    new ingest invalidates the whole cache without having to walk it. The
+    current version is fetched with `version_loader` at most once every
+    `version_ttl` seconds.
+
+    With a `shared` store, local misses are looked up there before running the
+    query, and loaded results are written to it for the other processes.
+    """
+
+    def __init__(
+        self,
+        version_loader: Callable[[], int],
+        maxsize: int = 256,
+        ttl: float = 3600.0,
+        version_ttl: float = 5.0,
+        shared: SharedResultStore | None = None,
+    ):
+        self.version_loader = version_loader
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.version_ttl = version_ttl
+        self.shared = shared
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[int, float, object]] = OrderedDict()
+        self._version: int | None = None
+        self._version_checked = 0.0
+        self._lock = threading.Lock()
+
+    def version(self) -> int:
+        now = time.monotonic()
+        if self._version is None or now - self._version_checked >= self.version_ttl:
+            version = self.version_loader()
+            with self._lock:
+                self._version, self._version_checked = version, now
+        return self._version
+
+    def expire_version(self) -> None:
+        """Force the next lookup to re-read the data version, e.g. right after an ingest."""
+        with self._lock:
+            self._version = None
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], object]) -> object:
+        version = self.version()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+
+        value = self.shared.get(key, version) if self.shared is not None else MISSING
+        if value is MISSING:
+            with self._lock:
+                self.misses += 1
+            value = loader()
+            if self.shared is not None:
+                self.shared.set(key, version, value, self.ttl)
+        else:
+            with self._lock:
+                self.shared_hits += 1
+
+        with self._lock:
+            self._entries[key] = (version, now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+        if self.shared is not None:
+            self.shared.clear()
+
+    def stats(self) -> dict[str, int | float | None]:
+        lookups = self.hits + self.shared_hits + self.misses
+        return {
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.shared_hits) / lookups if lookups else None,
+            "size": len(self._entries),
+            "version": self._version,
+        }
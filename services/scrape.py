@@ -1,9 +1,23 @@
+import asyncio
+import datetime
+import hashlib
 import json
 import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Iterator
+import httpx
+import lxml.html
 from bs4 import BeautifulSoup
+from setting import config
 from utils.logging import setup_logging
 from playwright.sync_api import sync_playwright
-from utils.client import HTTPX_SYNC_CLIENT
+from utils.client import get_sync_client, new_async_client
+from utils.throttle import CircuitBreaker, RetryPolicy, TokenBucket
+from utils.state import load_json_state, save_json_state
 
 setup_logging()
 logger = logging.getLogger(__name__)
@@ -22,18 +36,48 @@ TABLE_TAB_MAPPING = {
     "whenIssuedEntityTable": {"tab_href": "#tabs4", "js_function": "whenIssuedUpdateTable()"}
 }
 
+# Table headers of the rendered page mapped to the CCIL short names of the `result1`
+# payload, so browser rows can be archived and ingested like direct ones
+BROWSER_HEADER_KEYS = {
+    "Security Description": "ismt_idnt",
+    "Trades": "ttc",
+    "TTA": "tta",
+    "Open": "op",
+    "High": "hi",
+    "Low": "lo",
+    "LTP": "ltp",
+    "Arrow": "arrow",
+    "Indicator": "indicator",
+    "LTY": "lty",
+    "Previous Trade Rate": "prev_trad_rate",
+    "Trade Yield": "trade_yeild",
+    "Market Indicator": "mrkt_indc",
+    "Book Indicator": "book_indc",
+}
 
-def extract_table_data(content: str, table_name: str) -> list[dict]:
-    """
-    Extract data from the current page of a table.
-    
-    Args:
-        page: Playwright page object
-        table_name (str): The name of the table to extract data from
-    
-    Returns:
-        list[dict]: List of dictionaries containing row data
-    """
+# Returned instead of rows when a table's payload is unchanged since the last fetch
+NOT_MODIFIED = None
+
+# Responses worth retrying after a backoff: throttling, bot blocks and server errors
+RETRYABLE_STATUS_CODES = {403, 429, 500, 502, 503, 504}
+# Of those, the ones that mean we are going too fast
+THROTTLE_STATUS_CODES = {403, 429}
+
+# Per table day, digest of the last response body and the ETag/Last-Modified validators
+PAYLOAD_STATE_FILE = "scrape_payload_state.json"
+_PAYLOAD_STATE: dict[str, dict] | None = None
+
+
+class ScrapeHTTPError(ValueError):
+    """Non-200 response from a CCIL endpoint."""
+
+    def __init__(self, message: str, status_code: int, retry_after: float | None = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def _bs4_table_cells(content: str, table_name: str) -> tuple[list[str], list[list[str]]]:
     soup = BeautifulSoup(content, 'html.parser')
 
     table = soup.find('table', {'id': table_name})
@@ -57,29 +101,94 @@ def extract_table_data(content: str, table_name: str) -> list[dict]:
         logger.error(f"Table body (tbody) not found in the table with id '{table_name}'.")
         raise ValueError(f"Table body (tbody) not found in the table with id '{table_name}'.")
 
+    rows = [[cell.text.strip() for cell in row.find_all('td')] for row in tbody.find_all('tr')]
+    return headers, rows
+
+
+def _lxml_table_cells(content: str, table_name: str) -> tuple[list[str], list[list[str]]]:
+    # Same lookups as the BeautifulSoup version, on libxml2's tree: first table with
+    # the id, every th below it, its first tbody, then every tr and td in document order
+    root = lxml.html.document_fromstring(content)
+    tables = root.xpath('//table[@id=$id]', id=table_name)
+
+    if not tables:
+        logger.error(f"Table with id '{table_name}' not found in the HTML content.")
+        raise ValueError(f"Table with id '{table_name}' not found in the HTML content.")
+    table = tables[0]
+
+    headers = [header.text_content().strip() for header in table.iter('th')]
+    if not headers:
+        logger.error(f"No header found in the table with id '{table_name}'.")
+        raise ValueError(f"No header found in the table with id '{table_name}'.")
+
+    tbody = next(table.iter('tbody'), None)
+    if tbody is None:
+        logger.error(f"Table body (tbody) not found in the table with id '{table_name}'.")
+        raise ValueError(f"Table body (tbody) not found in the table with id '{table_name}'.")
+
+    rows = [[cell.text_content().strip() for cell in row.iter('td')] for row in tbody.iter('tr')]
+    return headers, rows
+
+
+# Parsing backends of `extract_table_data`, all returning identical rows
+TABLE_PARSERS = {
+    "html.parser": _bs4_table_cells,
+    "lxml": _lxml_table_cells,
+}
+
+
+def extract_table_data(content: str, table_name: str, parser: str = 'html.parser') -> list[dict]:
+    """
+    Extract data from the current page of a table.
+    
+    Args:
+        content (str): HTML of the page holding the table
+        table_name (str): The name of the table to extract data from
+        parser (str): 'html.parser' (BeautifulSoup) or 'lxml', an order of magnitude
+            faster on full CCIL pages
+    
+    Returns:
+        list[dict]: List of dictionaries containing row data
+    """
+    if parser not in TABLE_PARSERS:
+        raise ValueError(f"Parser must be one of {list(TABLE_PARSERS)}, got '{parser}'")
+    headers, body_rows = TABLE_PARSERS[parser](content, table_name)
 
     rows = []
-    for row in tbody.find_all('tr'):
-        cells = row.find_all('td')
+    for cells in body_rows:
         if len(cells) != len(headers):
             logger.warning(f"Row length {len(cells)} does not match header length {len(headers)}. Skipping row.")
             continue
-        row_data = {headers[i]: cells[i].text.strip() for i in range(len(headers)) if headers[i]}
+        row_data = {headers[i]: cells[i] for i in range(len(headers)) if headers[i]}
         rows.append(row_data)
 
     return rows
 
-def scrape_table_with_browser(url: str, table_name: str, max_wait_time: int = 30) -> list[dict]:
+def scrape_table_with_browser(
+    url: str,
+    table_name: str,
+    max_wait_time: int = 30,
+    parser: str = 'lxml',
+    workers: int = 1,
+) -> list[dict]:
     """
     Scrape table data by waiting for dynamic content to load.
+
+    The browser only paginates and reads each page's table HTML. Pages are parsed
+    in the browser loop, or with `workers` > 1 by a pool of worker processes while
+    the browser moves on. lxml parses a whole saved page in about 6 ms against about
+    80 ms for html.parser (scripts/bench_parse.py), small next to a pagination round
+    trip, so pages are parsed inline by default. Pages are merged back in page order.
     
     Args:
         url (str): The URL to scrape
         table_name (str): The name of the table to scrape
         max_wait_time (int): Maximum time to wait for content to load
+        parser (str): `extract_table_data` parser used on each page
+        workers (int): Number of parse processes, 1 parses in the browser loop
     
     Returns:
-        list[dict]: A list of dictionaries containing the scraped data
+        list[dict]: A list of dictionaries containing the scraped data, keyed by the CCIL short names
     """
     if table_name not in TABLE_ENDPOINTS:
         raise ValueError(f"Table name '{table_name}' is not in the list of valid tables: {TABLE_ENDPOINTS.keys()}")
@@ -112,66 +221,593 @@ def scrape_table_with_browser(url: str, table_name: str, max_wait_time: int = 30
             browser.close()
             return []
         
-        all_data = []
-        page_number = 1
-        
-        while True:
-            logger.info(f"Scraping page {page_number}")
-            
-            # Get current page data
-            page_data = extract_table_data(page.content(), table_name)
-            all_data.extend(page_data)
-            
-            # Check if there's a next page
-            next_button = page.query_selector(f"#{table_name}_next")
-            if next_button and not next_button.get_attribute('class') or 'disabled' not in next_button.get_attribute('class'):
-                next_button.click()
-                page.wait_for_timeout(1000)  # Wait for page to load 1 seconds
-                page_number += 1
-            else:
-                break
-        
+        pages = _iter_table_page_html(page, table_name, max_wait_time)
+        if workers <= 1:
+            page_rows = [extract_table_data(html, table_name, parser=parser) for html in pages]
+        else:
+            # Pages are submitted as soon as they are read, so the browser moves on
+            # to the next page while the worker processes parse the previous ones
+            # Spawned, not forked: this process runs the Playwright driver and may be a worker thread
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+                futures = [executor.submit(extract_table_data, html, table_name, parser) for html in pages]
+                page_rows = [future.result() for future in futures]
+
         browser.close()
-        return all_data
+        return to_source_keys(merge_table_pages(page_rows))
+
+
+def merge_table_pages(page_rows: list[list[dict]]) -> list[dict]:
+    """
+    Concatenate the rows of successive table pages in page order, dropping repeated rows.
+
+    A table redrawn by a live update while it is paginated can show a row on two pages;
+    only its first occurrence is kept.
+    """
+    seen = set()
+    merged = []
+    for rows in page_rows:
+        for row in rows:
+            key = tuple(row.items())
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(row)
+    return merged
+
+
+def to_source_keys(rows: list[dict]) -> list[dict]:
+    """
+    Rename the header keys of browser rows to the CCIL short names of the `result1` payload.
+
+    Headers missing from `BROWSER_HEADER_KEYS` are kept as they are.
+    """
+    return [{BROWSER_HEADER_KEYS.get(header, header): value for header, value in row.items()} for row in rows]
+
+
+# Requests the table pages do not need: media, fonts and third party analytics
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+BLOCKED_URL_PARTS = ("google-analytics.com", "googletagmanager.com", "doubleclick.net", "facebook.net", "hotjar.com")
+
+# Mirrors `extract_table_data` in the page: same headers, same skipped rows, same dicts.
+# Also reports whether the table has a next page, so each page costs one round trip.
+_EXTRACT_ROWS_JS = """
+(tableId) => {
+    const table = document.getElementById(tableId);
+    if (!table || table.tagName !== 'TABLE') return {error: `Table with id '${tableId}' not found in the HTML content.`};
+    const headers = Array.from(table.querySelectorAll('th'), (th) => th.textContent.trim());
+    if (headers.length === 0) return {error: `No header found in the table with id '${tableId}'.`};
+    const tbody = table.querySelector('tbody');
+    if (!tbody) return {error: `Table body (tbody) not found in the table with id '${tableId}'.`};
+    const rows = [];
+    let skipped = 0;
+    for (const tr of tbody.querySelectorAll('tr')) {
+        const cells = tr.querySelectorAll('td');
+        if (cells.length !== headers.length) { skipped += 1; continue; }
+        const row = {};
+        headers.forEach((header, i) => { if (header) row[header] = cells[i].textContent.trim(); });
+        rows.push(row);
+    }
+    const next = document.getElementById(`${tableId}_next`);
+    return {rows, skipped, hasNext: !!next && !next.classList.contains('disabled')};
+}
+"""
+
+# Only the table's own markup is shipped to the parsers, not the whole page
+_TABLE_HTML_JS = """
+(tableId) => {
+    const table = document.getElementById(tableId);
+    if (!table) return null;
+    const next = document.getElementById(`${tableId}_next`);
+    return {html: table.outerHTML, hasNext: !!next && !next.classList.contains('disabled')};
+}
+"""
+
+# Clicks the next button and resolves once the table is redrawn: on the DataTables
+# `draw.dt` event, or on any change of the tbody if the event is not available.
+_NEXT_PAGE_JS = """
+([tableId, timeoutMs]) => new Promise((resolve) => {
+    const table = document.getElementById(tableId);
+    const body = () => (table.tBodies[0] ? table.tBodies[0].innerHTML : '');
+    const before = body();
+    let done = false;
+    const observer = new MutationObserver(() => { if (body() !== before) finish('mutation'); });
+    const timer = setTimeout(() => finish('timeout'), timeoutMs);
+    function finish(how) {
+        if (done) return;
+        done = true;
+        observer.disconnect();
+        clearTimeout(timer);
+        resolve(how);
+    }
+    observer.observe(table, {childList: true, subtree: true, characterData: true});
+    if (window.jQuery) window.jQuery(table).one('draw.dt', () => finish('draw'));
+    document.getElementById(`${tableId}_next`).click();
+})
+"""
+
+
+def _block_unneeded_requests(route) -> None:
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(part in request.url for part in BLOCKED_URL_PARTS):
+        route.abort()
+    else:
+        route.continue_()
+
+
+def _iter_table_page_html(page, table_name: str, max_wait_time: int) -> Iterator[str]:
+    """Yield the outer HTML of the table on each of its pages, paginating until the last one."""
+    page_number = 1
+    while True:
+        result = page.evaluate(_TABLE_HTML_JS, table_name)
+        if result is None:
+            logger.error(f"Table with id '{table_name}' not found in the HTML content.")
+            raise ValueError(f"Table with id '{table_name}' not found in the HTML content.")
+        logger.info(f"Read page {page_number} of '{table_name}'")
+        yield result["html"]
+        if not result["hasNext"]:
+            return
+        if page.evaluate(_NEXT_PAGE_JS, [table_name, max_wait_time * 1000]) == "timeout":
+            logger.warning(f"Table '{table_name}' was not redrawn after {max_wait_time}s, stopping at page {page_number}.")
+            return
+        page_number += 1
+
+
+def _extract_table_pages(page, table_name: str, max_wait_time: int) -> list[dict]:
+    """Collect every page of an open table, extracting rows in the page itself."""
+    all_data = []
+    page_number = 1
+    while True:
+        result = page.evaluate(_EXTRACT_ROWS_JS, table_name)
+        if "error" in result:
+            logger.error(result["error"])
+            raise ValueError(result["error"])
+        if result["skipped"]:
+            logger.warning(f"Skipped {result['skipped']} rows of '{table_name}' page {page_number} not matching the header length.")
+        all_data.extend(result["rows"])
+        if not result["hasNext"]:
+            break
+        how = page.evaluate(_NEXT_PAGE_JS, [table_name, max_wait_time * 1000])
+        if how == "timeout":
+            logger.warning(f"Table '{table_name}' was not redrawn after {max_wait_time}s, stopping at page {page_number}.")
+            break
+        page_number += 1
+    logger.info(f"Scraped {len(all_data)} rows over {page_number} pages of '{table_name}'")
+    return all_data
+
+
+def scrape_tables_with_browser(url: str, table_names: list[str] | None = None, max_wait_time: int = 30) -> dict[str, list[dict]]:
+    """
+    Scrape several tables in one headless browser session.
+
+    The page is loaded once with images, fonts and analytics blocked, then each
+    table's tab is opened in turn. Rows are extracted by a single `page.evaluate`
+    per page, and pagination waits on the table redraw instead of sleeping.
+
+    Args:
+        url (str): The URL to scrape
+        table_names (list[str] | None): Tables to scrape, all of TABLE_TAB_MAPPING by default
+        max_wait_time (int): Maximum time in seconds to wait for a tab or a page to load
+
+    Returns:
+        dict[str, list[dict]]: Rows per table name, keyed by the CCIL short names
+    """
+    table_names = table_names or list(TABLE_TAB_MAPPING)
+    for table_name in table_names:
+        if table_name not in TABLE_TAB_MAPPING:
+            raise ValueError(f"Table name '{table_name}' is not in the list of valid tables: {TABLE_TAB_MAPPING.keys()}")
+
+    timeout_ms = max_wait_time * 1000
+    results = {}
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        try:
+            page = browser.new_page()
+            page.route("**/*", _block_unneeded_requests)
+            page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
+
+            for table_name in table_names:
+                tab_href = TABLE_TAB_MAPPING[table_name]["tab_href"]
+                logger.info(f"Clicking tab for table '{table_name}': {tab_href}")
+                page.click(f"a[href='{tab_href}']", timeout=timeout_ms)
+                page.wait_for_selector(f"#{table_name} tbody tr", timeout=timeout_ms)
+                results[table_name] = to_source_keys(_extract_table_pages(page, table_name, max_wait_time))
+        finally:
+            browser.close()
+    return results
  
 
-def scrape_table_direct(url: str, table_name: str) -> list[dict]:
+def _ajax_url(url: str, table_name: str) -> str:
+    if table_name not in TABLE_ENDPOINTS:
+        raise ValueError(f"Table name '{table_name}' is not in the list of valid tables: {TABLE_ENDPOINTS.keys()}")
+    
+    resource_id = TABLE_ENDPOINTS[table_name]
+    
+    # Construct the AJAX URL based on the JavaScript code
+    return f"{url}?p_p_id=com_ccil_ndsom_entire_CCILNdsOM_EntirePortlet_INSTANCE_zavb&p_p_lifecycle=2&p_p_state=normal&p_p_mode=view&p_p_resource_id={resource_id}&p_p_cacheability=cacheLevelPage"
+
+
+def _payload_state_path() -> Path:
+    return Path(config.get_settings().cache_dir) / PAYLOAD_STATE_FILE
+
+
+def _payload_state() -> dict[str, dict]:
+    global _PAYLOAD_STATE
+    if _PAYLOAD_STATE is None:
+        _PAYLOAD_STATE = load_json_state(_payload_state_path(), default={})
+    return _PAYLOAD_STATE
+
+
+def _todays_payload_state(table_name: str) -> dict:
+    """
+    Saved state of a table, empty when it was saved on an earlier day: an identical
+    payload on a new trading day is new data and must be ingested again.
+    """
+    state = _payload_state().get(table_name, {})
+    return state if state.get("day") == datetime.date.today().isoformat() else {}
+
+
+def save_payload_state(table_name: str, payload_state: dict | None) -> None:
+    """
+    Store the digest and validators returned with a table's rows, so the next
+    fetch of the same payload is skipped. Call it only once the rows are consumed
+    (archived, ingested): a payload whose ingest failed must be parsed again.
+    """
+    if payload_state is None:
+        return
+    _payload_state()[table_name] = payload_state
+    save_json_state(_payload_state_path(), _payload_state())
+
+
+def _conditional_headers(table_name: str, skip_unchanged: bool) -> dict[str, str]:
+    state = _todays_payload_state(table_name) if skip_unchanged else {}
+    headers = {}
+    if state.get("etag"):
+        headers["If-None-Match"] = state["etag"]
+    if state.get("last_modified"):
+        headers["If-Modified-Since"] = state["last_modified"]
+    return headers
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+
+def _parse_response(
+    url: str, table_name: str, response: httpx.Response, skip_unchanged: bool
+) -> tuple[list[dict] | None, dict | None]:
+    """Rows of a response, or NOT_MODIFIED, with the payload state to save once they are consumed."""
+    if skip_unchanged and response.status_code == 304:
+        logger.info(f"Table '{table_name}' not modified (HTTP 304).")
+        return NOT_MODIFIED, None
+    if response.status_code != 200:
+        logger.error(f"Failed to retrieve data from {url}, status code: {response.status_code}")
+        raise ScrapeHTTPError(
+            f"Failed to retrieve data from {url}, status code: {response.status_code}",
+            response.status_code,
+            _retry_after(response),
+        )
+    
+    # Hashed before any decoding, so an unchanged payload costs no JSON parse at all
+    digest = hashlib.blake2b(response.content, digest_size=16).hexdigest()
+    if skip_unchanged and _todays_payload_state(table_name).get("digest") == digest:
+        logger.info(f"Table '{table_name}' payload unchanged, skipping parse.")
+        return NOT_MODIFIED, None
+
+    try:
+        table_data = json.loads(response.json()['result1'])
+    except Exception as e:
+        logger.error(f"Failed to parse JSON response: {e} type: {type(e)}")    
+        return [], None
+
+    payload_state = None
+    if skip_unchanged:
+        payload_state = {
+            "day": datetime.date.today().isoformat(),
+            "digest": digest,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+    return table_data, payload_state
+
+
+def scrape_table_direct(
+    url: str,
+    table_name: str,
+    skip_unchanged: bool = False,
+    client: httpx.Client | None = None,
+    timeout: float | None = None,
+) -> tuple[list[dict] | None, dict | None]:
     """
     Scrape table data directly from AJAX endpoints.
     
     Args:
         url (str): The base URL
         table_name (str): The name of the table to scrape
+        skip_unchanged (bool): Return NOT_MODIFIED when the payload matches the last fetch
+        client (httpx.Client | None): Client to use, the shared pooled client by default
+        timeout (float | None): Timeout of this request, the client default when omitted
     
     Returns:
-        list[dict]: A list of dictionaries containing the scraped data
+        tuple[list[dict] | None, dict | None]: The scraped rows, or NOT_MODIFIED, and the payload
+        state to pass to `save_payload_state` once the rows are consumed (None without skip_unchanged)
     """
-    if table_name not in TABLE_ENDPOINTS:
-        raise ValueError(f"Table name '{table_name}' is not in the list of valid tables: {TABLE_ENDPOINTS.keys()}")
-    
-    resource_id = TABLE_ENDPOINTS[table_name]
+    ajax_url = _ajax_url(url, table_name)
+    client = client or get_sync_client()
+    response = client.post(
+        ajax_url,
+        data={},
+        headers=_conditional_headers(table_name, skip_unchanged),
+        timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+    )
+    return _parse_response(url, table_name, response, skip_unchanged)
+
+
+async def scrape_table_direct_async(
+    client: httpx.AsyncClient, url: str, table_name: str, skip_unchanged: bool = False, timeout: float | None = None
+) -> tuple[list[dict] | None, dict | None]:
+    """
+    Scrape table data directly from AJAX endpoints without blocking the event loop.
     
-    # Construct the AJAX URL based on the JavaScript code
-    ajax_url = f"{url}?p_p_id=com_ccil_ndsom_entire_CCILNdsOM_EntirePortlet_INSTANCE_zavb&p_p_lifecycle=2&p_p_state=normal&p_p_mode=view&p_p_resource_id={resource_id}&p_p_cacheability=cacheLevelPage"
+    Args:
+        client (httpx.AsyncClient): Client shared by the concurrent requests
+        url (str): The base URL
+        table_name (str): The name of the table to scrape
+        skip_unchanged (bool): Return NOT_MODIFIED when the payload matches the last fetch
+        timeout (float | None): Timeout of this request, the client default when omitted
     
-    with HTTPX_SYNC_CLIENT as client:
-        response = client.post(ajax_url, data={})
-        if response.status_code != 200:
-            logger.error(f"Failed to retrieve data from {url}, status code: {response.status_code}")
-            raise ValueError(f"Failed to retrieve data from {url}, status code: {response.status_code}")
-        
-        data = response.json()
+    Returns:
+        tuple[list[dict] | None, dict | None]: Rows and payload state, as `scrape_table_direct`
+    """
+    ajax_url = _ajax_url(url, table_name)
+    response = await client.post(
+        ajax_url,
+        data={},
+        headers=_conditional_headers(table_name, skip_unchanged),
+        timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+    )
+    return _parse_response(url, table_name, response, skip_unchanged)
+
+
+@lru_cache()
+def endpoint_limiter(table_name: str) -> TokenBucket:
+    """Request budget of a table's endpoint, shared by every scrape in the process."""
+    settings = config.get_settings()
+    per_minute = settings.scrape_endpoint_rates.get(table_name, settings.scrape_rate_per_minute)
+    return TokenBucket(rate=per_minute / 60, capacity=settings.scrape_burst)
+
+
+@lru_cache()
+def get_retry_policy() -> RetryPolicy:
+    settings = config.get_settings()
+    return RetryPolicy(settings.scrape_max_attempts, settings.scrape_backoff_base, settings.scrape_backoff_max)
+
+
+@lru_cache()
+def get_direct_breaker() -> CircuitBreaker:
+    """Circuit of the direct AJAX mode, opened when the site keeps refusing it."""
+    settings = config.get_settings()
+    return CircuitBreaker("direct", settings.scrape_breaker_threshold, settings.scrape_breaker_reset)
+
+
+def _retry_delay(table_name: str, attempt: int, error: Exception) -> float | None:
+    """Seconds to wait before retrying a failed request, None when it must not be retried."""
+    policy = get_retry_policy()
+    if isinstance(error, ScrapeHTTPError):
+        if error.status_code not in RETRYABLE_STATUS_CODES:
+            return None
+        if error.status_code in THROTTLE_STATUS_CODES:
+            endpoint_limiter(table_name).penalize()
+    elif not isinstance(error, httpx.TransportError):
+        return None
+    if attempt + 1 >= policy.max_attempts:
+        return None
+    delay = policy.delay(attempt, getattr(error, "retry_after", None))
+    logger.warning(f"Attempt {attempt + 1} on '{table_name}' failed ({error}), retrying in {delay:.1f}s.")
+    return delay
+
+
+def scrape_table_direct_with_retry(
+    url: str,
+    table_name: str,
+    skip_unchanged: bool = False,
+    client: httpx.Client | None = None,
+    timeout: float | None = None,
+) -> tuple[list[dict] | None, dict | None]:
+    """
+    `scrape_table_direct` paced by the endpoint's token bucket and retried with
+    jittered exponential backoff on throttling, server and network errors.
+    """
+    limiter = endpoint_limiter(table_name)
+    attempt = 0
+    while True:
+        limiter.acquire()
         try:
-            table_data = json.loads(data['result1'])
-            return table_data
+            result = scrape_table_direct(url, table_name, skip_unchanged, client, timeout)
         except Exception as e:
-            logger.error(f"Failed to parse JSON response: {e} type: {type(e)}")    
-            return []
+            delay = _retry_delay(table_name, attempt, e)
+            if delay is None:
+                raise
+            time.sleep(delay)
+            attempt += 1
+        else:
+            limiter.reward()
+            return result
+
+
+async def scrape_table_direct_with_retry_async(
+    client: httpx.AsyncClient, url: str, table_name: str, skip_unchanged: bool = False, timeout: float | None = None
+) -> tuple[list[dict] | None, dict | None]:
+    """Async counterpart of `scrape_table_direct_with_retry`."""
+    limiter = endpoint_limiter(table_name)
+    attempt = 0
+    while True:
+        await limiter.acquire_async()
+        try:
+            result = await scrape_table_direct_async(client, url, table_name, skip_unchanged, timeout)
+        except Exception as e:
+            delay = _retry_delay(table_name, attempt, e)
+            if delay is None:
+                raise
+            await asyncio.sleep(delay)
+            attempt += 1
+        else:
+            limiter.reward()
+            return result
+
+
+def _should_fall_back(table_name: str, error: Exception) -> bool:
+    """Record a failed direct scrape, True once the circuit is open and the browser must take over."""
+    breaker = get_direct_breaker()
+    breaker.record_failure()
+    if breaker.allow():
+        return False
+    logger.warning(f"Direct scrape of '{table_name}' failed ({error}), falling back to the headless browser.")
+    return True
+
+
+async def scrape_table_guarded_async(
+    client: httpx.AsyncClient, url: str, table_name: str, skip_unchanged: bool = False
+) -> tuple[list[dict] | None, dict | None] | None:
+    """
+    Scrape a table through the direct endpoint with retries, behind the direct circuit.
+
+    Returns:
+        tuple | None: Rows and payload state, or None when the circuit is open and
+        the table must be scraped with the headless browser instead
+    """
+    breaker = get_direct_breaker()
+    if not breaker.allow():
+        return None
+    try:
+        result = await scrape_table_direct_with_retry_async(client, url, table_name, skip_unchanged)
+    except Exception as e:
+        if not _should_fall_back(table_name, e):
+            raise
+        return None
+    breaker.record_success()
+    return result
+
+
+async def scrape_tables_async(
+    url: str,
+    table_names: list[str] | None = None,
+    max_concurrency: int = 4,
+    on_result: Callable[[str, list[dict]], None] | None = None,
+    client: httpx.AsyncClient | None = None,
+    skip_unchanged: bool = False,
+) -> dict[str, list[dict]]:
+    """
+    Scrape several tables concurrently, handing each one over as soon as it is parsed.
+
+    Requests are paced per endpoint and retried with backoff. Tables that fall back
+    while the direct circuit is open are scraped together afterwards, in one
+    headless browser session.
+    
+    Args:
+        url (str): The base URL
+        table_names (list[str] | None): Tables to scrape, defaults to all of TABLE_ENDPOINTS
+        max_concurrency (int): Maximum number of requests in flight
+        on_result (Callable | None): Called in a worker thread with (table_name, rows) as each table arrives
+        client (httpx.AsyncClient | None): Client to reuse, a new one is opened when omitted
+        skip_unchanged (bool): Leave out tables whose payload matches the last fetch
+    
+    Returns:
+        dict[str, list[dict]]: Rows per table, failed and unchanged tables are left out
+    """
+    table_names = table_names or list(TABLE_ENDPOINTS)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch(client: httpx.AsyncClient, table_name: str) -> tuple[str, tuple | None, bool]:
+        async with semaphore:
+            try:
+                return table_name, await scrape_table_guarded_async(client, url, table_name, skip_unchanged), True
+            except Exception as e:
+                logger.error(f"Failed to scrape table '{table_name}': {e}")
+                return table_name, None, False
+
+    async def hand_off(results: dict, table_name: str, rows: list[dict] | None, payload_state: dict | None) -> None:
+        if rows is NOT_MODIFIED:
+            return
+        logger.info(f"Scraped {len(rows)} rows from '{table_name}'")
+        results[table_name] = rows
+        if on_result is not None:
+            # Ingest is blocking DB work, keep it off the event loop
+            await asyncio.to_thread(on_result, table_name, rows)
+        # Only a consumed payload may be skipped next time
+        save_payload_state(table_name, payload_state)
+
+    async def run(client: httpx.AsyncClient) -> dict[str, list[dict]]:
+        results = {}
+        browser_tables = []
+        tasks = [asyncio.create_task(fetch(client, table_name)) for table_name in table_names]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                table_name, result, ok = await next_result
+                if not ok:
+                    continue
+                if result is None:
+                    browser_tables.append(table_name)
+                    continue
+                await hand_off(results, table_name, *result)
+        except BaseException:
+            # Do not leave fetches running behind a failed ingest
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        if browser_tables:
+            # One browser for every fallen-back table, instead of one per concurrent fetch
+            try:
+                browser_results = await asyncio.to_thread(scrape_tables_with_browser, url, browser_tables)
+            except Exception as e:
+                logger.error(f"Headless browser fallback failed for {browser_tables}: {e}")
+                browser_results = {}
+            for table_name, rows in browser_results.items():
+                await hand_off(results, table_name, rows, None)
+        return results
+
+    if client is not None:
+        return await run(client)
+    async with new_async_client() as client:
+        return await run(client)
+
+
+def scrape_all_tables(
+    url: str,
+    table_names: list[str] | None = None,
+    max_concurrency: int = 4,
+    on_result: Callable[[str, list[dict]], None] | None = None,
+    skip_unchanged: bool = False,
+) -> dict[str, list[dict]]:
+    """
+    Synchronous entry point for `scrape_tables_async`.
+    """
+    return asyncio.run(scrape_tables_async(url, table_names, max_concurrency, on_result, skip_unchanged=skip_unchanged))
+
         
-def scrape_table(url: str, table_name: str, method: str = 'direct') -> list[dict]:
+def scrape_table(url: str, table_name: str, method: str = 'direct', skip_unchanged: bool = False) -> list[dict] | None:
     if method == 'direct':
-        return scrape_table_direct(url, table_name)
+        breaker = get_direct_breaker()
+        if breaker.allow():
+            try:
+                rows, payload_state = scrape_table_direct_with_retry(url, table_name, skip_unchanged)
+            except Exception as e:
+                if not _should_fall_back(table_name, e):
+                    raise
+            else:
+                breaker.record_success()
+                # Saved on hand-off: an ingest that must retry a failed payload uses
+                # scrape_tables_async, which saves it only after on_result succeeds
+                save_payload_state(table_name, payload_state)
+                return rows
+        return scrape_table_with_browser(url, table_name)
     elif method == 'headless_browser':
         return scrape_table_with_browser(url, table_name)
+    elif method == 'headless_browser_fast':
+        return scrape_tables_with_browser(url, [table_name])[table_name]
     else:
-        raise ValueError("Method must be 'ajax' or 'headless_browser'")
\ No newline at end of file
+        raise ValueError("Method must be 'direct', 'headless_browser' or 'headless_browser_fast'")
\ No newline at end of file
@@ -0,0 +1,60 @@
+import bisect
+
+
+class SecurityIndex:
+    """
+    In-memory search index over the security universe, for typeahead lookups.
+
+    Names are kept sorted by their casefolded form, so prefix matches are a
+    binary search followed by a walk over the matching slice. Word-prefix
+    (e.g. "2033" in "7.18% GS 2033") and substring matches fill up the
+    remaining slots, in that order.
+    """
+
+    def __init__(self, descriptions: list[str]):
+        self._names = sorted(set(descriptions), key=str.casefold)
+        self._keys = [name.casefold() for name in self._names]
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def search(self, text: str, limit: int = 20) -> list[str]:
+        """
+        Return up to `limit` names matching `text`, case-insensitively.
+
+        Args:
+            text (str): Typed text, an empty string lists the first names
+            limit (int): Maximum number of matches
+
+        Returns:
+            list[str]: Prefix matches first, then word-prefix, then substring matches
+        """
+        query = text.strip().casefold()
+        if not query:
+            return self._names[:limit]
+
+        matches = []
+        start = bisect.bisect_left(self._keys, query)
+        for index in range(start, len(self._keys)):
+            if len(matches) >= limit or not self._keys[index].startswith(query):
+                break
+            matches.append(self._names[index])
+        if len(matches) >= limit:
+            return matches
+
+        word_prefix, substring = [], []
+        for name, key in zip(self._names, self._keys):
+            if key.startswith(query):
+                continue
+            position = key.find(query)
+            if position < 0:
+                continue
+            while position > 0 and key[position - 1].isalnum():
+                position = key.find(query, position + 1)
+            if position > 0:
+                word_prefix.append(name)
+                if len(matches) + len(word_prefix) >= limit:
+                    break
+            elif len(matches) + len(word_prefix) + len(substring) < limit:
+                substring.append(name)
+        return (matches + word_prefix + substring)[:limit]
@@ -0,0 +1,96 @@
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Hashable
+from utils.logging import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+# Returned by `get` when no usable entry exists, None being a valid cached value
+MISSING = object()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    expires REAL NOT NULL,
+    value BLOB NOT NULL
+)
+"""
+
+
+class SharedResultStore:
+    """
+    Pickled query results shared by every process of the host, in one SQLite file.
+
+    Used as the second tier of VersionedQueryCache, so a result loaded by one web
+    worker is served to the others without another database round trip. SQLite
+    in WAL mode gives concurrent readers and serialized writers without any
+    external service. WAL needs shared memory, so the file must be on a local
+    disk, not a network share. Connections are opened per process and thread, so the store
+    can be created before gunicorn forks its workers.
+    """
+
+    def __init__(self, path: str | Path, maxsize: int = 1024):
+        self.path = Path(path)
+        self.maxsize = maxsize
+        self._local = threading.local()
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._connect() as connection:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute(_SCHEMA)
+        except (OSError, sqlite3.Error) as e:
+            # Reads and writes then fail one by one and fall back to the database
+            logger.warning(f"Shared cache {self.path} unavailable, ignoring it: {e}")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+
+    def _connection(self) -> sqlite3.Connection:
+        # A connection must not cross a fork, reopen it in each worker process
+        if getattr(self._local, "pid", None) != os.getpid():
+            self._local.connection = self._connect()
+            self._local.connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.pid = os.getpid()
+        return self._local.connection
+
+    def get(self, key: Hashable, version: int) -> object:
+        """Return the value stored for `key` at `version`, or MISSING."""
+        try:
+            row = self._connection().execute(
+                "SELECT value FROM entries WHERE key = ? AND version = ? AND expires > ?",
+                (repr(key), version, time.time()),
+            ).fetchone()
+            return pickle.loads(row[0]) if row else MISSING
+        except (sqlite3.Error, pickle.PickleError) as e:
+            logger.warning(f"Shared cache read failed, ignoring it: {e}")
+            return MISSING
+
+    def set(self, key: Hashable, version: int, value: object, ttl: float) -> None:
+        try:
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            connection = self._connection()
+            connection.execute(
+                "INSERT OR REPLACE INTO entries (key, version, expires, value) VALUES (?, ?, ?, ?)",
+                (repr(key), version, time.time() + ttl, payload),
+            )
+            # Entries of older versions can never be served again
+            connection.execute("DELETE FROM entries WHERE version < ? OR expires <= ?", (version, time.time()))
+            connection.execute(
+                "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY expires DESC LIMIT -1 OFFSET ?)",
+                (self.maxsize,),
+            )
+        except (sqlite3.Error, pickle.PickleError) as e:
+            logger.warning(f"Shared cache write failed, ignoring it: {e}")
+
+    def clear(self) -> None:
+        try:
+            self._connection().execute("DELETE FROM entries")
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache clear failed, ignoring it: {e}")
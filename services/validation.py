@@ -0,0 +1,72 @@
+import datetime
+import logging
+import numpy as np
+import pandas as pd
+from services.market_batch import MarketBatch
+from utils.logging import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+# CCIL short names of the `result1` payload mapped to regular_market columns
+SOURCE_COLUMNS = {
+    "ismt_idnt": "security_desc",
+    "ttc": "trades",
+    "tta": "tta",
+    "op": "open",
+    "hi": "high",
+    "lo": "low",
+    "ltp": "ltp",
+    "lty": "lty",
+}
+NUMERIC_COLUMNS = ["trades", "tta", "open", "high", "low", "ltp", "lty"]
+
+
+def validate_regular_market(data: list[dict], timestamp: datetime.datetime) -> tuple[MarketBatch, dict[str, int]]:
+    """
+    Validate and coerce a CCIL `result1` payload in one vectorized pass.
+
+    Every column is cast at once with `pd.to_numeric`, and a boolean reject mask
+    is built from the per-column failures instead of parsing row by row.
+
+    Args:
+        data (list[dict]): Rows as returned by the CCIL `result1` payload
+        timestamp (datetime): Snapshot time stamped on every clean row
+
+    Returns:
+        tuple[MarketBatch, dict[str, int]]: The clean typed rows (last occurrence
+        of a security kept) and the number of rejected rows, in total and per
+        reason (a row can fail for several reasons)
+    """
+    raw = pd.DataFrame.from_records(data, columns=list(SOURCE_COLUMNS)).rename(columns=SOURCE_COLUMNS)
+
+    reasons = {"missing_security_desc": raw["security_desc"].isna().to_numpy()}
+    columns = {}
+    for column in NUMERIC_COLUMNS:
+        values = pd.to_numeric(raw[column], errors="coerce").to_numpy(dtype="float64")
+        invalid = np.isnan(values)
+        if column == "trades":
+            invalid |= ~np.isnan(values) & (np.mod(values, 1) != 0)
+        reasons[f"invalid_{column}"] = invalid
+        columns[column] = values
+
+    reject_mask = np.zeros(len(raw), dtype=bool)
+    for mask in reasons.values():
+        reject_mask |= mask
+    rejects = {"total": int(reject_mask.sum())}
+    rejects.update({reason: int(mask.sum()) for reason, mask in reasons.items() if mask.any()})
+    if rejects["total"]:
+        logger.warning(f"Rejected {rejects['total']} of {len(raw)} rows: {rejects}")
+
+    keep = ~reject_mask
+    security_desc = raw["security_desc"].to_numpy()[keep].astype(str)
+    # The staging table key is unique per (security, snapshot): keep the last occurrence
+    _, last_index = np.unique(security_desc[::-1], return_index=True)
+    keep_index = np.sort(len(security_desc) - 1 - last_index)
+
+    batch = MarketBatch.from_columns(
+        security_desc=security_desc[keep_index],
+        **{column: values[keep][keep_index] for column, values in columns.items()},
+        timestamp=np.full(len(keep_index), np.datetime64(timestamp, "us")),
+    )
+    return batch, rejects
@@ -23,6 +23,52 @@ class Settings(BaseSettings):
     pg_database: str
     
     debug: bool = False
+
+    # SQLAlchemy connection pool of each process, gunicorn.conf.py sizes it per web worker
+    db_pool_size: int = 20
+    db_max_overflow: int = 10
+    # Seconds after which a pooled connection is replaced, below Azure SQL's idle timeout
+    db_pool_recycle: int = 1200
+
+    # Local directory for state persisted between runs (fingerprints, digests, ...)
+    cache_dir: str = ".cache"
+    # Root of the compressed raw scrape archive
+    archive_dir: str = "archive"
+    # Root of the partitioned Parquet export used for offline analytics
+    parquet_dir: str = "parquet"
+
+    # Connection pool of the shared HTTP clients, see utils/client.py
+    http_max_connections: int = 10
+    http_max_keepalive_connections: int = 5
+    # Seconds an idle connection is kept open for reuse
+    http_keepalive_expiry: float = 60.0
+    # Default request timeout and connect timeout, in seconds
+    http_timeout: float = 60.0
+    http_connect_timeout: float = 10.0
+    # HTTP/2 needs the optional 'h2' package (httpx[http2])
+    http2: bool = False
+
+    # Request budget of each CCIL endpoint, in requests per minute and burst size.
+    # scrape_endpoint_rates overrides the rate per table name, e.g. {"oddLotEntityTable": 2}
+    scrape_rate_per_minute: float = 6.0
+    scrape_burst: int = 2
+    scrape_endpoint_rates: dict[str, float] = {}
+    # Retries of a failed request, with jittered exponential backoff (seconds)
+    scrape_max_attempts: int = 4
+    scrape_backoff_base: float = 2.0
+    scrape_backoff_max: float = 120.0
+    # Consecutive failed direct scrapes before falling back to the headless browser,
+    # and seconds before direct requests are tried again
+    scrape_breaker_threshold: int = 3
+    scrape_breaker_reset: float = 900.0
+
+    # Dashboard query cache: max entries, entry TTL and how often the data version is re-read (seconds)
+    query_cache_size: int = 256
+    query_cache_ttl: float = 3600.0
+    query_cache_version_ttl: float = 5.0
+    # Share query results between the processes of the host through a SQLite file in cache_dir
+    shared_query_cache: bool = False
+    shared_query_cache_size: int = 1024
     
 @lru_cache()
 def get_settings():
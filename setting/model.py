@@ -1,7 +1,6 @@
 from typing import Optional
 from sqlalchemy import Integer
-from sqlmodel import Field, SQLModel, String, DateTime
-from sqlalchemy.dialects.mssql import REAL
+from sqlmodel import Field, SQLModel, String, DateTime, Date, BigInteger, Float
 import datetime
 
 class RegularMarket(SQLModel, table=True):
@@ -10,10 +9,48 @@ class RegularMarket(SQLModel, table=True):
     id: Optional[int] = Field(sa_type=Integer, default=None, primary_key=True)
     security_desc: str = Field(sa_type=String(255), nullable=False)
     trades: int = Field(sa_type=Integer, nullable=False)
-    tta: float = Field(sa_type=REAL, nullable=False)
-    open: float = Field(sa_type=REAL, nullable=False)
-    high: float = Field(sa_type=REAL, nullable=False)
-    low: float = Field(sa_type=REAL, nullable=False)
-    ltp: float = Field(sa_type=REAL, nullable=False)
-    lty: float = Field(sa_type=REAL, nullable=False)
+    tta: float = Field(sa_type=Float, nullable=False)
+    open: float = Field(sa_type=Float, nullable=False)
+    high: float = Field(sa_type=Float, nullable=False)
+    low: float = Field(sa_type=Float, nullable=False)
+    ltp: float = Field(sa_type=Float, nullable=False)
+    lty: float = Field(sa_type=Float, nullable=False)
     timestamp: datetime.datetime = Field(sa_type=DateTime, nullable=False)
+
+
+class RegularMarketTick(SQLModel, table=True):
+    """Append-only intraday snapshot, clustered on (security_desc, timestamp)."""
+    __tablename__ = "regular_market_ticks"
+
+    security_desc: str = Field(sa_type=String(255), primary_key=True)
+    trades: int = Field(sa_type=Integer, nullable=False)
+    tta: float = Field(sa_type=Float(53), nullable=False)
+    open: float = Field(sa_type=Float(53), nullable=False)
+    high: float = Field(sa_type=Float(53), nullable=False)
+    low: float = Field(sa_type=Float(53), nullable=False)
+    ltp: float = Field(sa_type=Float(53), nullable=False)
+    lty: float = Field(sa_type=Float(53), nullable=False)
+    timestamp: datetime.datetime = Field(sa_type=DateTime, primary_key=True)
+
+
+class RegularMarketDaily(SQLModel, table=True):
+    """Daily rollup of regular_market, maintained by the ingest for the keys it touches."""
+    __tablename__ = "regular_market_daily"
+
+    security_desc: str = Field(sa_type=String(255), primary_key=True)
+    trade_date: datetime.date = Field(sa_type=Date, primary_key=True)
+    trades: int = Field(sa_type=BigInteger, nullable=False)
+    tta: float = Field(sa_type=Float, nullable=False)
+    high: float = Field(sa_type=Float(53), nullable=False)
+    low: float = Field(sa_type=Float(53), nullable=False)
+    ltp: float = Field(sa_type=Float(53), nullable=False)
+    last_timestamp: datetime.datetime = Field(sa_type=DateTime, nullable=False)
+
+
+class DataVersion(SQLModel, table=True):
+    """Counter bumped by every ingest that changes a table, used to invalidate read caches."""
+    __tablename__ = "data_version"
+
+    name: str = Field(sa_type=String(64), primary_key=True)
+    version: int = Field(sa_type=BigInteger, nullable=False, default=0)
+    updated_at: datetime.datetime = Field(sa_type=DateTime, nullable=False)
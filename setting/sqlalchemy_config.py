@@ -14,7 +14,19 @@ SQL_ALCHEMY_URL = (
     "&hostNameInCertificate=*.database.windows.net"
 )
 
-ENGINE = create_engine(SQL_ALCHEMY_URL, echo=settings.debug, pool_size=20, max_overflow=10)
+ENGINE = create_engine(
+    SQL_ALCHEMY_URL,
+    echo=settings.debug,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    # Azure SQL drops idle connections after about 30 minutes, and the ingest daemon
+    # idles for up to an hour off-market: check a connection before reusing it and
+    # replace the ones older than db_pool_recycle seconds
+    pool_pre_ping=True,
+    pool_recycle=settings.db_pool_recycle,
+    # Send executemany batches (staging loads, bulk inserts) as one round trip
+    fast_executemany=True,
+)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=ENGINE, expire_on_commit=False)
 
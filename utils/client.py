@@ -1,3 +1,73 @@
+import atexit
+import importlib.util
+import logging
+import threading
 import httpx
+from setting import config
+from utils.logging import setup_logging
 
-HTTPX_SYNC_CLIENT = httpx.Client(timeout=60)
\ No newline at end of file
+setup_logging()
+logger = logging.getLogger(__name__)
+
+_SYNC_CLIENT: httpx.Client | None = None
+_SYNC_CLIENT_LOCK = threading.Lock()
+
+
+def _client_options() -> dict:
+    """Pool limits, keep-alive, timeouts and protocol shared by the sync and async clients."""
+    settings = config.get_settings()
+    http2 = settings.http2
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("HTTP/2 requested but the 'h2' package is not installed, falling back to HTTP/1.1.")
+        http2 = False
+    return {
+        "limits": httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        ),
+        "timeout": httpx.Timeout(settings.http_timeout, connect=settings.http_connect_timeout),
+        "http2": http2,
+    }
+
+
+def get_sync_client() -> httpx.Client:
+    """
+    Return the process-wide sync client, opening it on first use.
+
+    The client is long-lived so repeated requests reuse pooled connections and skip
+    the TCP/TLS handshake. Do not use it as a context manager, that would close it
+    for every other caller; call `close_sync_client` on shutdown instead.
+    """
+    global _SYNC_CLIENT
+    with _SYNC_CLIENT_LOCK:
+        if _SYNC_CLIENT is None or _SYNC_CLIENT.is_closed:
+            _SYNC_CLIENT = httpx.Client(**_client_options())
+            logger.info("Opened shared HTTP client.")
+        return _SYNC_CLIENT
+
+
+def close_sync_client() -> None:
+    """Close the shared sync client, a later `get_sync_client` opens a new one."""
+    global _SYNC_CLIENT
+    with _SYNC_CLIENT_LOCK:
+        if _SYNC_CLIENT is not None and not _SYNC_CLIENT.is_closed:
+            _SYNC_CLIENT.close()
+            logger.info("Closed shared HTTP client.")
+        _SYNC_CLIENT = None
+
+
+def close_clients() -> None:
+    """Shutdown hook, also run at interpreter exit."""
+    close_sync_client()
+
+
+atexit.register(close_clients)
+
+
+def new_async_client() -> httpx.AsyncClient:
+    """
+    Async clients are bound to an event loop, so each loop opens its own, with the
+    same pool and timeout settings. Keep it open for the lifetime of the loop.
+    """
+    return httpx.AsyncClient(**_client_options())
@@ -0,0 +1,22 @@
+import json
+import os
+from pathlib import Path
+
+
+def load_json_state(path: Path, default=None):
+    """Load a JSON state file, returning `default` when it is missing or unreadable."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return default
+
+
+def save_json_state(path: Path, state) -> None:
+    """Atomically replace a JSON state file so readers never see a partial write."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, separators=(",", ":"), default=str)
+    os.replace(tmp_path, path)
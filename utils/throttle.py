@@ -0,0 +1,115 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from utils.logging import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket with an adaptive refill rate.
+
+    `rate` tokens are added per second up to `capacity`. Callers reserve a token
+    and sleep until it is due, so concurrent callers queue up instead of bursting.
+    The rate is halved on every `penalize` (e.g. an HTTP 429) down to `min_rate`,
+    and recovers additively on every `reward`, back to the configured rate.
+    """
+
+    def __init__(self, rate: float, capacity: float, min_rate: float | None = None):
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = min_rate if min_rate is not None else rate / 16
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token, possibly ahead of time, and return the seconds to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self) -> float:
+        wait = self._reserve()
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        wait = self._reserve()
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
+
+    def penalize(self) -> None:
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            logger.warning(f"Rate limited, slowing down to {self.rate * 60:.1f} requests/min.")
+
+    def reward(self) -> None:
+        with self._lock:
+            self.rate = min(self.base_rate, self.rate + self.base_rate / 10)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with full jitter: attempt n waits uniform(0, min(max_delay, base_delay * 2**n))."""
+    max_attempts: int = 4
+    base_delay: float = 2.0
+    max_delay: float = 120.0
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        if retry_after is not None:
+            # The server said when to come back, never retry earlier than that
+            return min(self.max_delay, retry_after) + random.uniform(0, self.base_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing dependency for `reset_timeout` seconds after
+    `failure_threshold` consecutive failures. Once the timeout has passed, calls
+    are let through again: a success closes the circuit, a failure reopens it.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 900.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        return self.state != "open"
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info(f"Circuit '{self.name}' closed.")
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                logger.warning(f"Circuit '{self.name}' open for {self.reset_timeout:.0f}s after {self._failures} failures.")